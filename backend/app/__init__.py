@@ -18,9 +18,21 @@ def create_app(env='development'):
     # Load config
     if env == 'production':
         app.config.from_object('app.config.ProductionConfig')
+    elif env == 'testing':
+        app.config.from_object('app.config.TestingConfig')
     else:
         app.config.from_object('app.config.DevelopmentConfig')
     
+    # Use the fastest available JSON encoder for responses
+    from app.utils.json_provider import json_provider_class
+    app.json = json_provider_class(app.config.get('JSON_PROVIDER', 'auto'))(app)
+    
+    # Size the connection pool for how this process is deployed
+    from app.utils.db_pool import engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(app.config), **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    }
+    
     # Initialize extensions
     db.init_app(app)
     CORS(app, supports_credentials=True, resources={
@@ -47,6 +59,13 @@ def create_app(env='development'):
     app.register_blueprint(dinner_bp, url_prefix='/api')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     
+    # Bad pagination cursors are client errors
+    from app.utils.pagination import InvalidCursor
+    
+    @app.errorhandler(InvalidCursor)
+    def invalid_cursor(error):
+        return jsonify({'error': str(error)}), 400
+    
     # Root route
     @app.route('/')
     def index():
@@ -55,17 +74,93 @@ def create_app(env='development'):
             'message': 'Dinner API is running'
         })
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Bring the database schema up to date
+    from app import migrations
+    if app.config.get('MIGRATE_ON_STARTUP', True):
+        with app.app_context():
+            migrations.upgrade(db.engine)
     
     # Add reset-db command
     @app.cli.command('reset-db')
     @click.confirmation_option(prompt='Are you sure you want to drop all tables and recreate them? This will delete all data!')
     def reset_db():
         """Drop all tables and recreate them."""
-        db.drop_all()
-        db.create_all()
+        migrations.reset(db.engine)
         click.echo('Database has been reset.')
     
+    # Add migration commands
+    @app.cli.command('migrate')
+    @click.option('--target', type=int, help='Stop after this version.')
+    def migrate(target):
+        """Apply pending schema migrations."""
+        applied = migrations.upgrade(db.engine, target)
+        for migration in applied:
+            click.echo(f'Applied {migration.version:03d} {migration.description}')
+        if not applied:
+            click.echo('Database is up to date.')
+    
+    @app.cli.command('migration-status')
+    def migration_status():
+        """List schema migrations and when they were applied."""
+        for version, description, applied_at in migrations.status(db.engine):
+            click.echo(f"{version:03d} {description:<70} {applied_at or 'pending'}")
+    
+    # Add query plan command
+    @app.cli.command('explain-queries')
+    def explain_queries():
+        """Print the database's plans for the hot-path queries."""
+        from app.utils.query_plans import hot_queries, explain
+        
+        for name, statement in hot_queries():
+            click.echo(f'== {name}')
+            for line in explain(statement):
+                click.echo(f'   {line}')
+    
+    # Add matching dry-run command
+    @app.cli.command('simulate-matching')
+    @click.option('--kota', multiple=True, help='Only simulate these cities.')
+    @click.option('--strategy', type=click.Choice(['scored', 'fifo']), help='Group formation strategy.')
+    @click.option('--workers', type=int, help='Worker processes for parallel planning.')
+    @click.option('--shard-by', type=click.Choice(['kota', 'bucket']), help='Shard key for parallel planning.')
+    @click.option('--json', 'as_json', is_flag=True, help='Print the full result as JSON.')
+    def simulate_matching(kota, strategy, workers, shard_by, as_json):
+        """Dry-run matching against the current database without writing."""
+        import json
+        from app.services import MatchingService
+        
+        result = MatchingService.simulate_matching(list(kota), strategy, workers, shard_by)
+        if as_json:
+            click.echo(json.dumps(result, indent=2))
+            return
+        
+        for bucket in sorted(result['buckets'], key=lambda b: (b['kota'], b['tanggal'] or '', b['waktu'])):
+            click.echo(f"{bucket['kota']:<15} {bucket['budget_preference']:<12} {bucket['tanggal']} "
+                       f"{bucket['waktu']:<12} {bucket['matched']:>6}/{bucket['pending']:<6} "
+                       f"{bucket['match_rate']:>6.1%}")
+        click.echo(f"{result['groups_formed']} groups, {result['matched']}/{result['pending']} matched "
+                   f"({result['match_rate']:.1%}), {result['unmatched']} unmatched, "
+                   f"{result['wall_time']:.3f}s, {result['queries']} queries")
+    
+    # Add stats rebuild command
+    @app.cli.command('rebuild-stats')
+    def rebuild_stats():
+        """Recount the dashboard counters from the tables."""
+        from app.services import StatsService
+        
+        for name, value in sorted(StatsService.rebuild().items()):
+            click.echo(f'{name:<40} {value:>10}')
+    
+    # Add matching worker command
+    @app.cli.command('matching-worker')
+    @click.option('--once', is_flag=True, help='Run queued (and due scheduled) jobs once, then exit.')
+    @click.option('--poll', type=float, help='Seconds between queue polls.')
+    def matching_worker(once, poll):
+        """Run matching and cleanup jobs outside the request cycle."""
+        from app.services import JobService
+        
+        if not once:
+            click.echo('Matching worker started.')
+        for job in JobService.work(poll, once) or []:
+            click.echo(f'Job {job.id} ({job.kind}) {job.status} in {job.duration:.2f}s')
+    
     return app 
\ No newline at end of file
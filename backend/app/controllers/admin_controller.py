@@ -1,13 +1,20 @@
-from flask import jsonify, request
-from app.models import User, Event, DinnerRegistration, DinnerGroup
+from flask import jsonify, request, session, current_app, Response, stream_with_context
+from app.models import User, Event, DinnerRegistration, DinnerGroup, MatchingJob
 from app import db
-from app.services import MatchingService
+from app.serializers import EventSerializer, DinnerSerializer
+from app.utils.pagination import paginate
+from app.utils.db_pool import pool_stats
+from app.services import MatchingService, MatchingConflict, JobService, ExportService, StatsService
+from app.services.export_service import REGISTRATION_FIELDS, GROUP_FIELDS
 
 class AdminController:
     @staticmethod
     def get_users():
-        users = User.query.all()
-        return jsonify([user.to_dict() for user in users])
+        users, pagination = paginate(User.query, [User.created_at, User.id])
+        return jsonify({
+            'users': [user.to_dict() for user in users],
+            'pagination': pagination
+        })
     
     @staticmethod
     def get_user(user_id):
@@ -64,23 +71,82 @@ class AdminController:
     
     @staticmethod
     def get_all_events():
-        events = Event.query.order_by(Event.date.desc()).all()
-        return jsonify([event.to_dict() for event in events])
+        rows, pagination = paginate(
+            EventSerializer.list_query(), [Event.date, Event.id], key=lambda row: (row[0].date, row[0].id)
+        )
+        return jsonify({
+            'events': [EventSerializer.admin_item(event, count) for event, count in rows],
+            'pagination': pagination
+        })
     
     @staticmethod
     def get_all_dinner_registrations():
-        registrations = DinnerRegistration.query.order_by(DinnerRegistration.created_at.desc()).all()
-        return jsonify([reg.to_dict() for reg in registrations])
+        query = DinnerRegistration.query.options(*DinnerSerializer.admin_registration_options())
+        if request.args.get('status'):
+            query = query.filter_by(status=request.args['status'])
+        registrations, pagination = paginate(query, [DinnerRegistration.created_at, DinnerRegistration.id])
+        return jsonify({
+            'registrations': [DinnerSerializer.admin_registration(reg) for reg in registrations],
+            'pagination': pagination
+        })
     
     @staticmethod
     def get_all_dinner_groups():
-        groups = DinnerGroup.query.order_by(DinnerGroup.created_at.desc()).all()
-        return jsonify([group.to_dict() for group in groups])
+        groups, pagination = paginate(
+            DinnerGroup.query.options(*DinnerSerializer.group_options()),
+            [DinnerGroup.created_at, DinnerGroup.id]
+        )
+        return jsonify({
+            'groups': [DinnerSerializer.group(group) for group in groups],
+            'pagination': pagination
+        })
+    
+    @staticmethod
+    def export_dinner_registrations():
+        """Stream every dinner registration as NDJSON or CSV."""
+        return AdminController._export(
+            'dinner-registrations', ExportService.registration_rows(request.args.get('status')), REGISTRATION_FIELDS
+        )
+    
+    @staticmethod
+    def export_dinner_groups():
+        """Stream every dinner group, with its members' registration ids, as NDJSON or CSV."""
+        return AdminController._export(
+            'dinner-groups', ExportService.group_rows(request.args.get('status')), GROUP_FIELDS
+        )
+    
+    @staticmethod
+    def _export(name, rows, fields):
+        export_format = request.args.get('format', 'ndjson')
+        if export_format == 'csv':
+            body, mimetype = ExportService.to_csv(rows, fields), 'text/csv'
+        elif export_format == 'ndjson':
+            body, mimetype = ExportService.to_ndjson(rows, fields), 'application/x-ndjson'
+        else:
+            return jsonify({'error': 'format must be ndjson or csv'}), 400
+        
+        # Rows are fetched as the response is sent, inside the request context
+        return Response(stream_with_context(body), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename={name}.{export_format}'
+        })
     
     @staticmethod
     def run_matching():
         """Run the matching algorithm manually."""
-        matched_groups = MatchingService.match_registrations()
+        if current_app.config.get('MATCHING_RUN_IN_BACKGROUND'):
+            # Leave the work to the matching worker instead of blocking this request
+            job = JobService.enqueue(
+                'match_and_cleanup', {'kota': request.args.getlist('kota')}, session.get('user_id')
+            )
+            return jsonify({
+                'message': 'Matching queued',
+                'job': job.to_dict()
+            }), 202
+        
+        try:
+            matched_groups = MatchingService.match_registrations(request.args.getlist('kota'))
+        except MatchingConflict as e:
+            return jsonify({'error': str(e)}), 409
         cleaned_up = MatchingService.cleanup_old_registrations()
         
         return jsonify({
@@ -89,25 +155,52 @@ class AdminController:
             'cleaned_up_registrations': cleaned_up
         })
     
+    @staticmethod
+    def simulate_matching():
+        """Dry-run the matching algorithm and return its metrics."""
+        result = MatchingService.simulate_matching(
+            kota=request.args.getlist('kota'),
+            strategy=request.args.get('strategy'),
+            workers=request.args.get('workers', type=int),
+            shard_by=request.args.get('shard_by')
+        )
+        return jsonify(result)
+    
+    @staticmethod
+    def get_matching_jobs():
+        """List recent matching jobs, newest first."""
+        query = MatchingJob.query
+        if request.args.get('status'):
+            query = query.filter_by(status=request.args['status'])
+        jobs = query.order_by(MatchingJob.created_at.desc()).limit(
+            min(request.args.get('limit', 20, type=int), 100)
+        ).all()
+        return jsonify([job.to_dict() for job in jobs])
+    
+    @staticmethod
+    def get_matching_job(job_id):
+        """Get a matching job's status, duration and result."""
+        job = MatchingJob.query.get_or_404(job_id)
+        return jsonify(job.to_dict())
+    
     @staticmethod
     def get_dashboard_stats():
         """Get statistics for the admin dashboard."""
-        total_users = User.query.count()
-        total_events = Event.query.count()
-        total_dinner_registrations = DinnerRegistration.query.count()
-        total_dinner_groups = DinnerGroup.query.count()
-        
-        # Get pending dinner registrations
-        pending_registrations = DinnerRegistration.query.filter_by(status='pending').count()
-        
-        # Get active events
-        active_events = Event.query.filter_by(status='active').count()
-        
-        return jsonify({
-            'total_users': total_users,
-            'total_events': total_events,
-            'total_dinner_registrations': total_dinner_registrations,
-            'total_dinner_groups': total_dinner_groups,
-            'pending_registrations': pending_registrations,
-            'active_events': active_events
-        }) 
\ No newline at end of file
+        # Read from the maintained counters, not COUNT(*) over every table
+        return jsonify(StatsService.dashboard())
+    
+    @staticmethod
+    def get_pool_stats():
+        """Get this process's connection pool state, checkout counts and latency."""
+        pool = db.engine.pool
+        state = {
+            'profile': current_app.config.get('DB_POOL_PROFILE', 'default'),
+            'pool_class': type(pool).__name__,
+            'status': pool.status()
+        }
+        # Only queue pools keep connections around to report on
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            if hasattr(pool, name):
+                state[name] = getattr(pool, name)()
+        state.update(pool_stats.to_dict())
+        return jsonify(state)
\ No newline at end of file
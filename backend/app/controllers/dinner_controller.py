@@ -1,12 +1,24 @@
-from flask import jsonify, request
+from flask import jsonify, current_app
 from app.models import DinnerRegistration, DinnerGroup
 from app.services import MatchingService
 from app import db
+from app.serializers import DinnerSerializer
 from datetime import datetime
 
 class DinnerController:
     @staticmethod
     def register_dinner(data, user):
+        # Group size limits bound the matcher's work, so they must be sane
+        min_participants = data.get('min_participants', 2)
+        max_participants = data.get('max_participants', 4)
+        max_group_size = current_app.config.get('MATCHING_MAX_GROUP_SIZE', 12)
+        if not all(type(value) is int for value in (min_participants, max_participants)) \
+                or not 1 <= min_participants <= max_participants <= max_group_size:
+            return jsonify({
+                'error': f'min_participants and max_participants must be whole numbers with '
+                         f'1 <= min_participants <= max_participants <= {max_group_size}'
+            }), 400
+        
         # Create new dinner registration
         registration = DinnerRegistration(
             user_id=user.id,
@@ -15,32 +27,41 @@ class DinnerController:
             tanggal_tersedia=datetime.fromisoformat(data['tanggal_tersedia']).date(),
             waktu_preference=data['waktu_preference'],
             makanan_preference=data.get('makanan_preference'),
-            min_participants=data.get('min_participants', 2),
-            max_participants=data.get('max_participants', 4)
+            min_participants=min_participants,
+            max_participants=max_participants,
+            gender=data.get('gender', user.gender),
+            age=data.get('age', user.age)
         )
         db.session.add(registration)
         db.session.commit()
         
         # Try to match with existing registrations
+        group = None
+        if current_app.config.get('MATCHING_ONLINE'):
+            group = MatchingService.match_registration(registration)
+        
         return jsonify({
             'message': 'Dinner registration successful',
-            'registration': registration.to_dict()
+            'registration': DinnerSerializer.registration(registration),
+            'group': DinnerSerializer.group(group) if group else None
         })
     
     @staticmethod
     def get_my_registrations(user):
         registrations = DinnerRegistration.query.filter_by(user_id=user.id, status='matched').all()
-        return jsonify([reg.to_dict() for reg in registrations])
+        return jsonify([DinnerSerializer.registration(reg) for reg in registrations])
     
     @staticmethod
     def get_dinner_group(group_id, user):
-        group = DinnerGroup.query.get_or_404(group_id)
+        group = DinnerGroup.query.options(
+            *DinnerSerializer.group_options()
+        ).filter_by(id=group_id).first_or_404()
         
         # Check if user is part of this group
         if not any(reg.user_id == user.id for reg in group.registrations):
             return jsonify({'error': 'Not authorized to view this group'}), 403
         
-        return jsonify(group.to_dict())
+        return jsonify(DinnerSerializer.group(group))
     
     @staticmethod
     def cancel_registration(registration_id, user):
@@ -54,35 +75,11 @@ class DinnerController:
         if registration.status not in ['pending', 'matched']:
             return jsonify({'error': 'Registration cannot be cancelled'}), 400
         
-        # If registration is part of a group, remove it
+        # If registration is part of a group, repair the group without it
         if registration.group_id:
-            group = registration.group
-            registration.group_id = None
-            registration.status = 'cancelled'
-            
-            # If group becomes empty, delete it
-            if len(group.registrations) <= 1:
-                db.session.delete(group)
-            else:
-                # Update other registrations in the group
-                for reg in group.registrations:
-                    if reg.id != registration.id:
-                        reg.status = 'pending'
-                        reg.group_id = None
+            MatchingService.repair_group(registration)
         else:
             registration.status = 'cancelled'
+            db.session.commit()
         
-        db.session.commit()
         return jsonify({'message': 'Registration cancelled successfully'})
-    
-    @staticmethod
-    def run_matching():
-        """Run the matching algorithm (admin only)."""
-        matched_groups = MatchingService.match_registrations()
-        cleaned_up = MatchingService.cleanup_old_registrations()
-        
-        return jsonify({
-            'message': 'Matching completed',
-            'matched_groups': [group.to_dict() for group in matched_groups],
-            'cleaned_up_registrations': cleaned_up
-        }) 
\ No newline at end of file
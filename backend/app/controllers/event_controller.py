@@ -1,7 +1,11 @@
-from flask import jsonify, request
+from flask import jsonify, request, current_app
 from app.models import Event, Registration
 from app import db
+from app.serializers import EventSerializer, RegistrationSerializer
+from app.services import EventCacheService
 from app.utils.helpers import save_file, delete_file
+from app.utils.pagination import paginate
+from app.utils.conditional import is_not_modified, set_validators
 from datetime import datetime
 
 class EventController:
@@ -21,21 +25,50 @@ class EventController:
         
         db.session.add(event)
         db.session.commit()
+        EventCacheService.invalidate()
         
         return jsonify({
             'message': 'Event created successfully',
-            'event': event.to_dict()
+            'event': EventSerializer.detail(event)
         }), 201
     
     @staticmethod
     def get_events():
-        events = Event.query.order_by(Event.date.desc()).all()
-        return jsonify([event.to_dict() for event in events])
+        cache_key = EventCacheService.list_key(request.query_string)
+        cached = EventCacheService.cached_response(cache_key)
+        if cached:
+            return cached
+        
+        # Answer revalidation from the validators alone, before loading any rows
+        etag, last_modified = EventSerializer.list_validators(request.query_string)
+        if is_not_modified(etag, last_modified):
+            return set_validators(current_app.response_class(status=304), etag, last_modified)
+        
+        rows, pagination = paginate(
+            EventSerializer.list_query(), [Event.date, Event.id], key=lambda row: (row[0].date, row[0].id)
+        )
+        response = jsonify({
+            'events': [EventSerializer.list_item(event, count) for event, count in rows],
+            'pagination': pagination
+        })
+        EventCacheService.store(cache_key, response, etag, last_modified)
+        return set_validators(response, etag, last_modified)
     
     @staticmethod
     def get_event(event_id):
-        event = Event.query.get_or_404(event_id)
-        return jsonify(event.to_dict())
+        cache_key = EventCacheService.detail_key(event_id)
+        cached = EventCacheService.cached_response(cache_key)
+        if cached:
+            return cached
+        
+        validators = EventSerializer.detail_validators(event_id)
+        if validators and is_not_modified(*validators):
+            return set_validators(current_app.response_class(status=304), *validators)
+        
+        event = Event.query.options(*EventSerializer.detail_options()).filter_by(id=event_id).first_or_404()
+        response = jsonify(EventSerializer.detail(event))
+        EventCacheService.store(cache_key, response, *validators)
+        return set_validators(response, *validators)
     
     @staticmethod
     def update_event(event_id, user):
@@ -62,9 +95,10 @@ class EventController:
             event.status = data['status']
         
         db.session.commit()
+        EventCacheService.invalidate(event_id)
         return jsonify({
             'message': 'Event updated successfully',
-            'event': event.to_dict()
+            'event': EventSerializer.detail(event)
         })
     
     @staticmethod
@@ -81,6 +115,7 @@ class EventController:
         
         db.session.delete(event)
         db.session.commit()
+        EventCacheService.invalidate(event_id)
         return jsonify({'message': 'Event deleted successfully'})
     
     @staticmethod
@@ -110,6 +145,7 @@ class EventController:
         # Update event image
         event.image = filename
         db.session.commit()
+        EventCacheService.invalidate(event_id)
         
         return jsonify({
             'message': 'Event image uploaded successfully',
@@ -134,17 +170,18 @@ class EventController:
             return jsonify({'error': 'Already registered for this event'}), 400
         
         # Check if event is full
-        if event.max_participants and len(event.registrations) >= event.max_participants:
+        if event.max_participants and Registration.query.filter_by(event_id=event_id).count() >= event.max_participants:
             return jsonify({'error': 'Event is full'}), 400
         
         # Create registration
         registration = Registration(user_id=user.id, event_id=event_id)
         db.session.add(registration)
         db.session.commit()
+        EventCacheService.invalidate(event_id)
         
         return jsonify({
             'message': 'Successfully registered for event',
-            'registration': registration.to_dict()
+            'registration': RegistrationSerializer.for_user(registration)
         })
     
     @staticmethod
@@ -156,5 +193,6 @@ class EventController:
         
         db.session.delete(registration)
         db.session.commit()
+        EventCacheService.invalidate(event_id)
         
         return jsonify({'message': 'Registration cancelled successfully'}) 
\ No newline at end of file
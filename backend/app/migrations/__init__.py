@@ -0,0 +1,148 @@
+"""Versioned schema migrations.
+
+Each ``vNNN_<name>.py`` module in this package defines ``version``,
+``description`` and ``upgrade(op)``. ``upgrade()`` applies the ones a
+database has not recorded in ``schema_migrations`` yet, in order, each in
+its own transaction.
+"""
+
+import importlib
+import pkgutil
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, insert, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+
+# Key of the PostgreSQL advisory lock taken while migrating, so app
+# instances starting together do not apply the same migration twice
+LOCK_KEY = 2024_0601
+
+versions = Table(
+    'schema_migrations', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200)),
+    Column('applied_at', DateTime)
+)
+
+class Operations:
+    """Schema changes available to a migration.
+    
+    Databases created by ``db.create_all()`` before migrations existed
+    already have part of the schema, so every step is skipped when what
+    it creates is already there.
+    """
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.metadata = MetaData()
+    
+    @property
+    def dialect(self):
+        return self.connection.dialect.name
+    
+    def has_table(self, table_name):
+        return inspect(self.connection).has_table(table_name)
+    
+    def has_column(self, table_name, column_name):
+        return column_name in {column['name'] for column in inspect(self.connection).get_columns(table_name)}
+    
+    def has_index(self, table_name, index_name):
+        return index_name in {index['name'] for index in inspect(self.connection).get_indexes(table_name)}
+    
+    def table(self, table_name):
+        """Reflect an existing table, e.g. to index it or reference it."""
+        if table_name not in self.metadata.tables:
+            Table(table_name, self.metadata, autoload_with=self.connection)
+        return self.metadata.tables[table_name]
+    
+    def create_table(self, table):
+        """Create a table (defined on ``self.metadata``) with its indexes."""
+        if not self.has_table(table.name):
+            table.create(self.connection)
+    
+    def add_column(self, table_name, column):
+        if not self.has_column(table_name, column.name):
+            ddl = CreateColumn(column).compile(dialect=self.connection.dialect)
+            self.connection.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {ddl}'))
+    
+    def create_index(self, index_name, table_name, columns, unique=False, where=None):
+        """Create an index; ``where`` (SQL text) makes it a partial index."""
+        if self.has_index(table_name, index_name):
+            return
+        table = self.table(table_name)
+        options = {f'{dialect}_where': text(where) for dialect in ('postgresql', 'sqlite')} if where else {}
+        Index(index_name, *(table.c[column] for column in columns), unique=unique, **options).create(self.connection)
+    
+    def drop_index(self, index_name, table_name):
+        if self.has_index(table_name, index_name):
+            self.connection.execute(text(f'DROP INDEX {index_name}'))
+    
+    def execute(self, statement, *args):
+        return self.connection.execute(statement, *args)
+
+def load_migrations():
+    """Import the migration modules, ordered by version."""
+    modules = [
+        importlib.import_module(f'{__name__}.{name}')
+        for _, name, _ in pkgutil.iter_modules(__path__) if name.startswith('v')
+    ]
+    return sorted(modules, key=lambda module: module.version)
+
+def lock(connection):
+    """Serialise migrating instances until the current transaction ends.
+    
+    The lock is transaction-scoped, not session-scoped, so it also holds
+    behind an external pooler in transaction mode (see ``DB_POOL_PROFILE``).
+    """
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': LOCK_KEY})
+
+def applied_versions(connection):
+    """Map each applied version to when it was applied."""
+    with connection.begin():
+        if not inspect(connection).has_table(versions.name):
+            lock(connection)
+            versions.create(connection, checkfirst=True)
+        return dict(connection.execute(select(versions.c.version, versions.c.applied_at)).all())
+
+def pending(connection, target=None):
+    applied = applied_versions(connection)
+    return [
+        migration for migration in load_migrations()
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+def upgrade(engine, target=None):
+    """Apply the pending migrations, up to ``target`` if given.
+    
+    Returns the migrations applied. A database that is up to date costs
+    one small query, so this is cheap enough to run at startup.
+    """
+    applied = []
+    with engine.connect() as connection:
+        for migration in pending(connection, target):
+            with connection.begin():
+                lock(connection)
+                # Another instance may have applied it while we waited for the lock
+                if connection.scalar(select(versions.c.version).where(versions.c.version == migration.version)):
+                    continue
+                migration.upgrade(Operations(connection))
+                connection.execute(insert(versions).values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.utcnow()
+                ))
+            applied.append(migration)
+    return applied
+
+def status(engine):
+    """Return ``(version, description, applied_at)`` for every migration, ``applied_at`` None if pending."""
+    with engine.connect() as connection:
+        applied = applied_versions(connection)
+    return [(migration.version, migration.description, applied.get(migration.version)) for migration in load_migrations()]
+
+def reset(engine):
+    """Drop every table, then migrate from scratch."""
+    metadata = MetaData()
+    metadata.reflect(engine)
+    metadata.drop_all(engine)
+    return upgrade(engine)
@@ -0,0 +1,76 @@
+"""The schema as ``db.create_all()`` created it before migrations existed."""
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, Table, Text
+
+version = 1
+description = 'Users, events, registrations and dinner tables'
+
+def upgrade(op):
+    op.create_table(Table(
+        'users', op.metadata,
+        Column('id', Integer, primary_key=True),
+        Column('username', String(80), unique=True, nullable=False),
+        Column('email', String(120), unique=True, nullable=False),
+        Column('password_hash', String(256)),
+        Column('full_name', String(100)),
+        Column('phone', String(20)),
+        Column('bio', Text),
+        Column('profile_image', String(200)),
+        Column('role', String(20)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('gender', String(20)),
+        Column('age', Integer)
+    ))
+    op.create_table(Table(
+        'events', op.metadata,
+        Column('id', Integer, primary_key=True),
+        Column('title', String(100), nullable=False),
+        Column('description', Text),
+        Column('location', String(200)),
+        Column('date', DateTime, nullable=False),
+        Column('max_participants', Integer),
+        Column('image', String(200)),
+        Column('status', String(20)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('organizer_id', Integer, ForeignKey('users.id'), nullable=False)
+    ))
+    op.create_table(Table(
+        'registrations', op.metadata,
+        Column('id', Integer, primary_key=True),
+        Column('status', String(20)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+        Column('event_id', Integer, ForeignKey('events.id'), nullable=False)
+    ))
+    op.create_table(Table(
+        'dinner_groups', op.metadata,
+        Column('id', Integer, primary_key=True),
+        Column('kota', String(100), nullable=False),
+        Column('budget_preference', String(50), nullable=False),
+        Column('tanggal', Date, nullable=False),
+        Column('waktu', String(50), nullable=False),
+        Column('status', String(20)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime)
+    ))
+    op.create_table(Table(
+        'dinner_registrations', op.metadata,
+        Column('id', Integer, primary_key=True),
+        Column('kota', String(100), nullable=False),
+        Column('budget_preference', String(50), nullable=False),
+        Column('tanggal_tersedia', Date, nullable=False),
+        Column('waktu_preference', String(50), nullable=False),
+        Column('makanan_preference', String(200)),
+        Column('min_participants', Integer),
+        Column('max_participants', Integer),
+        Column('status', String(20)),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('gender', String(20)),
+        Column('age', Integer),
+        Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+        Column('group_id', Integer, ForeignKey('dinner_groups.id'), nullable=True)
+    ))
@@ -0,0 +1,44 @@
+"""Food tags, background matching jobs and dashboard counters."""
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, JSON, String, Table, Text, select, update
+from app.utils.food_tags import parse_food_tags
+
+version = 2
+description = 'Food tag bitmask, matching_jobs and stat_counters'
+
+def upgrade(op):
+    op.add_column('dinner_registrations', Column('makanan_tags', Integer, nullable=False, server_default='0'))
+    
+    # Backfill the tags once per distinct preference text
+    registrations = op.table('dinner_registrations')
+    preferences = op.execute(select(registrations.c.makanan_preference).where(
+        registrations.c.makanan_preference.isnot(None)
+    ).distinct()).scalars().all()
+    for preference in preferences:
+        tags = parse_food_tags(preference)
+        if tags:
+            op.execute(update(registrations).where(
+                registrations.c.makanan_preference == preference
+            ).values(makanan_tags=tags))
+    
+    op.table('users')
+    op.create_table(Table(
+        'matching_jobs', op.metadata,
+        Column('id', Integer, primary_key=True),
+        Column('kind', String(20), nullable=False),
+        Column('status', String(20)),
+        Column('params', JSON),
+        Column('result', JSON),
+        Column('error', Text),
+        Column('created_at', DateTime),
+        Column('started_at', DateTime),
+        Column('finished_at', DateTime),
+        Column('requested_by', Integer, ForeignKey('users.id'), nullable=True),
+        Index('ix_matching_jobs_status_created', 'status', 'created_at')
+    ))
+    op.create_table(Table(
+        'stat_counters', op.metadata,
+        Column('name', String(80), primary_key=True),
+        Column('value', BigInteger, nullable=False),
+        Column('updated_at', DateTime)
+    ))
@@ -0,0 +1,22 @@
+"""Indexes behind matching buckets, keyset pagination and conditional GETs."""
+
+version = 3
+description = 'Bucket, pagination, foreign key and updated_at indexes'
+
+def upgrade(op):
+    # Keyset pagination: (sort key, id) on every paginated list
+    op.create_index('ix_events_date_id', 'events', ['date', 'id'])
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'])
+    op.create_index('ix_dinner_groups_created_at_id', 'dinner_groups', ['created_at', 'id'])
+    op.create_index('ix_dinner_registrations_created_at_id', 'dinner_registrations', ['created_at', 'id'])
+    
+    # Matching buckets and group membership
+    op.create_index('ix_dinner_registrations_bucket', 'dinner_registrations', [
+        'status', 'kota', 'budget_preference', 'tanggal_tersedia', 'waktu_preference', 'created_at'
+    ])
+    op.create_index('ix_dinner_registrations_group_id', 'dinner_registrations', ['group_id'])
+    op.create_index('ix_registrations_event_id', 'registrations', ['event_id'])
+    
+    # Latest change per table, for ETag/Last-Modified validators
+    for table_name in ('users', 'events', 'registrations'):
+        op.create_index(f'ix_{table_name}_updated_at', table_name, ['updated_at'])
@@ -0,0 +1,20 @@
+"""Composite and partial indexes for the matching and registration lookups."""
+
+version = 4
+description = 'Pending-only matching indexes and the (user_id, event_id) lookup'
+
+PENDING = "status = 'pending'"
+
+def upgrade(op):
+    # Matching only ever reads pending rows, a small and shrinking share of
+    # the table; partial indexes keep its lookups as small as that share
+    op.create_index('ix_dinner_registrations_pending_bucket', 'dinner_registrations', [
+        'kota', 'budget_preference', 'tanggal_tersedia', 'waktu_preference', 'created_at'
+    ], where=PENDING)
+    op.create_index('ix_dinner_registrations_pending_created', 'dinner_registrations', [
+        'created_at', 'id'
+    ], where=PENDING)
+    op.drop_index('ix_dinner_registrations_bucket', 'dinner_registrations')
+    
+    # "Already registered?" and "my events" look registrations up by user
+    op.create_index('ix_registrations_user_event', 'registrations', ['user_id', 'event_id'])
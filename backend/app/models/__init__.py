@@ -3,5 +3,7 @@ from .event import Event
 from .registration import Registration
 from .dinner_registration import DinnerRegistration
 from .group import DinnerGroup
+from .matching_job import MatchingJob
+from .stat_counter import StatCounter
 
-__all__ = ['User', 'Event', 'Registration', 'DinnerRegistration', 'DinnerGroup'] 
\ No newline at end of file
+__all__ = ['User', 'Event', 'Registration', 'DinnerRegistration', 'DinnerGroup', 'MatchingJob', 'StatCounter'] 
\ No newline at end of file
@@ -1,8 +1,20 @@
 from app import db
+from app.utils.food_tags import parse_food_tags, food_tag_names
 from datetime import datetime
+from sqlalchemy.orm import validates
 
 class DinnerRegistration(db.Model):
     __tablename__ = 'dinner_registrations'
+    __table_args__ = (
+        # Serve the bucket lookup and pool scan of matching, over pending rows only
+        db.Index('ix_dinner_registrations_pending_bucket', 'kota', 'budget_preference',
+                 'tanggal_tersedia', 'waktu_preference', 'created_at',
+                 postgresql_where=db.text("status = 'pending'"), sqlite_where=db.text("status = 'pending'")),
+        db.Index('ix_dinner_registrations_pending_created', 'created_at', 'id',
+                 postgresql_where=db.text("status = 'pending'"), sqlite_where=db.text("status = 'pending'")),
+        # Serves keyset pagination of the admin registrations list
+        db.Index('ix_dinner_registrations_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     kota = db.Column(db.String(100), nullable=False)
@@ -10,6 +22,7 @@ class DinnerRegistration(db.Model):
     tanggal_tersedia = db.Column(db.Date, nullable=False)
     waktu_preference = db.Column(db.String(50), nullable=False)
     makanan_preference = db.Column(db.String(200))
+    makanan_tags = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Bitmask of FOOD_TAGS parsed from makanan_preference
     min_participants = db.Column(db.Integer, default=2)
     max_participants = db.Column(db.Integer, default=4)
     status = db.Column(db.String(20), default='pending')  # 'pending', 'matched', 'completed', 'cancelled'
@@ -20,10 +33,11 @@ class DinnerRegistration(db.Model):
     
     # Foreign keys
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    group_id = db.Column(db.Integer, db.ForeignKey('dinner_groups.id'), nullable=True)
+    group_id = db.Column(db.Integer, db.ForeignKey('dinner_groups.id'), nullable=True, index=True)
     
     def __init__(self, user_id, kota, budget_preference, tanggal_tersedia, waktu_preference,
-                 makanan_preference=None, min_participants=2, max_participants=4, status='pending'):
+                 makanan_preference=None, min_participants=2, max_participants=4, status='pending',
+                 gender=None, age=None):
         self.user_id = user_id
         self.kota = kota
         self.budget_preference = budget_preference
@@ -33,6 +47,14 @@ class DinnerRegistration(db.Model):
         self.min_participants = min_participants
         self.max_participants = max_participants
         self.status = status
+        self.gender = gender
+        self.age = age
+    
+    @validates('makanan_preference')
+    def validate_makanan_preference(self, key, makanan_preference):
+        # Keep the parsed tags in step with the free text
+        self.makanan_tags = parse_food_tags(makanan_preference)
+        return makanan_preference
     
     def to_dict(self):
         return {
@@ -43,9 +65,12 @@ class DinnerRegistration(db.Model):
             'tanggal_tersedia': self.tanggal_tersedia.isoformat() if self.tanggal_tersedia else None,
             'waktu_preference': self.waktu_preference,
             'makanan_preference': self.makanan_preference,
+            'makanan_tags': food_tag_names(self.makanan_tags or 0),
             'min_participants': self.min_participants,
             'max_participants': self.max_participants,
             'status': self.status,
+            'gender': self.gender,
+            'age': self.age,
             'group_id': self.group_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
@@ -3,6 +3,10 @@ from datetime import datetime
 
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # Serves keyset pagination of the events list
+        db.Index('ix_events_date_id', 'date', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
@@ -13,7 +17,7 @@ class Event(db.Model):
     image = db.Column(db.String(200))
     status = db.Column(db.String(20), default='active')  # 'active', 'cancelled', 'completed'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Foreign keys
     organizer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -43,9 +47,7 @@ class Event(db.Model):
             'status': self.status,
             'organizer_id': self.organizer_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'organizer': self.organizer.to_dict() if self.organizer else None,
-            'registrations': [reg.to_dict() for reg in self.registrations]
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def __repr__(self):
@@ -3,6 +3,10 @@ from datetime import datetime
 
 class DinnerGroup(db.Model):
     __tablename__ = 'dinner_groups'
+    __table_args__ = (
+        # Serves keyset pagination of the admin groups list
+        db.Index('ix_dinner_groups_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     kota = db.Column(db.String(100), nullable=False)
@@ -32,8 +36,7 @@ class DinnerGroup(db.Model):
             'waktu': self.waktu,
             'status': self.status,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'registrations': [reg.to_dict() for reg in self.registrations]
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def __repr__(self):
@@ -0,0 +1,53 @@
+from app import db
+from datetime import datetime
+
+class MatchingJob(db.Model):
+    __tablename__ = 'matching_jobs'
+    __table_args__ = (
+        # Serves the worker's "oldest queued job" lookup
+        db.Index('ix_matching_jobs_status_created', 'status', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # 'match', 'cleanup', 'match_and_cleanup'
+    status = db.Column(db.String(20), default='queued')  # 'queued', 'running', 'succeeded', 'failed'
+    params = db.Column(db.JSON)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    # Foreign keys
+    requested_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # None for scheduled jobs
+    
+    def __init__(self, kind, params=None, requested_by=None, status='queued'):
+        self.kind = kind
+        self.params = params or {}
+        self.requested_by = requested_by
+        self.status = status
+    
+    @property
+    def duration(self):
+        """Seconds the job ran for, or has been running."""
+        if not self.started_at:
+            return None
+        return ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params,
+            'result': self.result,
+            'error': self.error,
+            'requested_by': self.requested_by,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration': self.duration
+        }
+    
+    def __repr__(self):
+        return f'<MatchingJob {self.id} {self.kind} {self.status}>'
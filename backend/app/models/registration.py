@@ -3,15 +3,19 @@ from datetime import datetime
 
 class Registration(db.Model):
     __tablename__ = 'registrations'
+    __table_args__ = (
+        # Serves "already registered?" and the user's own registrations
+        db.Index('ix_registrations_user_event', 'user_id', 'event_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     status = db.Column(db.String(20), default='pending')  # 'pending', 'approved', 'rejected'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Foreign keys
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
     
     def __init__(self, user_id, event_id, status='pending'):
         self.user_id = user_id
@@ -25,9 +29,7 @@ class Registration(db.Model):
             'user_id': self.user_id,
             'event_id': self.event_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'user': self.user.to_dict() if self.user else None,
-            'event': self.event.to_dict() if self.event else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
     def __repr__(self):
@@ -0,0 +1,17 @@
+from app import db
+from datetime import datetime
+
+class StatCounter(db.Model):
+    __tablename__ = 'stat_counters'
+    
+    # 'users', 'events', 'events:active', 'dinner_registrations:pending', ...
+    name = db.Column(db.String(80), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __init__(self, name, value=0):
+        self.name = name
+        self.value = value
+    
+    def __repr__(self):
+        return f'<StatCounter {self.name}={self.value}>'
\ No newline at end of file
@@ -1,12 +1,13 @@
 from flask import Blueprint
 from app.controllers import AdminController
-from app.utils import admin_required
+from app.utils import admin_required, query_budget
 
 admin_bp = Blueprint('admin', __name__)
 
 # User management
 @admin_bp.route('/users', methods=['GET'])
 @admin_required
+@query_budget(1)
 def get_users():
     return AdminController.get_users()
 
@@ -28,27 +29,60 @@ def delete_user(user_id):
 # Event management
 @admin_bp.route('/events', methods=['GET'])
 @admin_required
+@query_budget(1)
 def get_all_events():
     return AdminController.get_all_events()
 
 # Dinner management
 @admin_bp.route('/dinner-registrations', methods=['GET'])
 @admin_required
+@query_budget(1)
 def get_all_dinner_registrations():
     return AdminController.get_all_dinner_registrations()
 
 @admin_bp.route('/dinner-groups', methods=['GET'])
 @admin_required
+@query_budget(2)
 def get_all_dinner_groups():
     return AdminController.get_all_dinner_groups()
 
+@admin_bp.route('/export/dinner-registrations', methods=['GET'])
+@admin_required
+def export_dinner_registrations():
+    return AdminController.export_dinner_registrations()
+
+@admin_bp.route('/export/dinner-groups', methods=['GET'])
+@admin_required
+def export_dinner_groups():
+    return AdminController.export_dinner_groups()
+
 @admin_bp.route('/run-matching', methods=['POST'])
 @admin_required
 def run_matching():
     return AdminController.run_matching()
 
+@admin_bp.route('/run-matching/dry-run', methods=['GET'])
+@admin_required
+def simulate_matching():
+    return AdminController.simulate_matching()
+
+@admin_bp.route('/matching-jobs', methods=['GET'])
+@admin_required
+def get_matching_jobs():
+    return AdminController.get_matching_jobs()
+
+@admin_bp.route('/matching-jobs/<int:job_id>', methods=['GET'])
+@admin_required
+def get_matching_job(job_id):
+    return AdminController.get_matching_job(job_id)
+
 # Dashboard
 @admin_bp.route('/dashboard/stats', methods=['GET'])
 @admin_required
 def get_dashboard_stats():
-    return AdminController.get_dashboard_stats() 
\ No newline at end of file
+    return AdminController.get_dashboard_stats()
+
+@admin_bp.route('/dashboard/db-pool', methods=['GET'])
+@admin_required
+def get_pool_stats():
+    return AdminController.get_pool_stats()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.utils import login_required, admin_required, get_current_user
-from app.controllers import DinnerController
+from app.controllers import AdminController, DinnerController
 
 dinner_bp = Blueprint('dinner', __name__)
 dinner_controller = DinnerController()
@@ -34,4 +34,4 @@ def cancel_registration(registration_id):
 @dinner_bp.route('/admin/run-matching', methods=['POST'])
 @admin_required
 def run_matching():
-    return dinner_controller.run_matching_algorithm() 
\ No newline at end of file
+    return AdminController.run_matching()
\ No newline at end of file
@@ -1,15 +1,17 @@
 from flask import Blueprint, request, jsonify
-from app.utils import login_required, admin_required, get_current_user
+from app.utils import login_required, admin_required, get_current_user, query_budget
 from app.controllers import EventController
 
 events_bp = Blueprint('events', __name__)
 event_controller = EventController()
 
 @events_bp.route('/events', methods=['GET'])
+@query_budget(2)
 def get_events():
     return event_controller.get_events()
 
 @events_bp.route('/events/<int:event_id>', methods=['GET'])
+@query_budget(3)
 def get_event(event_id):
     return event_controller.get_event(event_id)
 
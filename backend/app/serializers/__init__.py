@@ -0,0 +1,5 @@
+from .user_serializer import UserSerializer
+from .event_serializer import EventSerializer, RegistrationSerializer
+from .dinner_serializer import DinnerSerializer
+
+__all__ = ['UserSerializer', 'EventSerializer', 'RegistrationSerializer', 'DinnerSerializer']
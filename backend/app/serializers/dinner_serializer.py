@@ -0,0 +1,42 @@
+from sqlalchemy.orm import joinedload, selectinload
+from app.models import DinnerGroup, DinnerRegistration
+from .user_serializer import UserSerializer
+
+class DinnerSerializer:
+    """Projections of dinner registrations and groups."""
+    
+    @staticmethod
+    def group_options():
+        """Loader options for ``group``: members and their users."""
+        return (selectinload(DinnerGroup.registrations).joinedload(DinnerRegistration.user),)
+    
+    @staticmethod
+    def admin_registration_options():
+        """Loader options for ``admin_registration``: the registering user."""
+        return (joinedload(DinnerRegistration.user),)
+    
+    @staticmethod
+    def registration(registration):
+        """A dinner registration on its own."""
+        return registration.to_dict()
+    
+    @staticmethod
+    def group(group):
+        """A group with its members' registrations and public profiles."""
+        data = group.to_dict()
+        data['registrations'] = [DinnerSerializer.member(reg) for reg in group.registrations]
+        return data
+    
+    @staticmethod
+    def member(registration):
+        """A registration as listed inside its group."""
+        data = registration.to_dict()
+        data['user'] = UserSerializer.summary(registration.user)
+        return data
+    
+    @staticmethod
+    def admin_registration(registration):
+        """A registration for the admin list, with the user's contact details."""
+        data = registration.to_dict()
+        data['user'] = UserSerializer.contact(registration.user)
+        return data
@@ -0,0 +1,112 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, selectinload
+from app.models import Event, Registration, User
+from app import db
+from app.utils.conditional import make_validators
+from .user_serializer import UserSerializer
+
+class EventSerializer:
+    """Per-endpoint projections of events.
+    
+    Every projection only reads relationships its loader eagerly loads, so
+    a response costs a fixed number of queries however many rows it has.
+    """
+    
+    @staticmethod
+    def registration_count():
+        """Correlated count of an event's registrations, selected next to the event."""
+        return select(func.count(Registration.id)).where(
+            Registration.event_id == Event.id
+        ).correlate(Event).scalar_subquery()
+    
+    @staticmethod
+    def list_query():
+        """Events with their organizer and registration count, in one query."""
+        return db.session.query(Event, EventSerializer.registration_count()).options(
+            joinedload(Event.organizer)
+        )
+    
+    @staticmethod
+    def detail_options():
+        """Loader options for ``detail``: organizer plus registrations and their users."""
+        return (
+            joinedload(Event.organizer),
+            selectinload(Event.registrations).joinedload(Registration.user)
+        )
+    
+    @staticmethod
+    def list_validators(*extra):
+        """ETag and Last-Modified for the events list, without loading any event.
+        
+        Built from the latest ``updated_at`` and the row count of every
+        table the list projection reads, in one statement of index-backed
+        aggregates. ``extra`` (e.g. the query string) is mixed into the ETag.
+        """
+        row = db.session.execute(select(
+            select(func.max(Event.updated_at)).scalar_subquery(),
+            select(func.count(Event.id)).scalar_subquery(),
+            select(func.max(Registration.updated_at)).scalar_subquery(),
+            select(func.count(Registration.id)).scalar_subquery(),
+            select(func.max(User.updated_at)).scalar_subquery()
+        )).one()
+        return make_validators(*extra, *row)
+    
+    @staticmethod
+    def detail_validators(event_id):
+        """ETag and Last-Modified for one event page, or ``None`` if it does not exist."""
+        row = db.session.execute(select(
+            Event.updated_at,
+            User.updated_at,
+            select(func.max(Registration.updated_at)).where(
+                Registration.event_id == event_id
+            ).scalar_subquery(),
+            select(func.count(Registration.id)).where(
+                Registration.event_id == event_id
+            ).scalar_subquery(),
+            select(func.max(User.updated_at)).join(
+                Registration, Registration.user_id == User.id
+            ).where(Registration.event_id == event_id).scalar_subquery()
+        ).join(User, User.id == Event.organizer_id).where(Event.id == event_id)).first()
+        return make_validators(event_id, *row) if row else None
+    
+    @staticmethod
+    def list_item(event, registration_count):
+        """Event card for the public list."""
+        data = event.to_dict()
+        data['organizer'] = UserSerializer.summary(event.organizer)
+        data['registration_count'] = registration_count
+        return data
+    
+    @staticmethod
+    def detail(event):
+        """Single event page with its registrations."""
+        data = event.to_dict()
+        data['organizer'] = UserSerializer.summary(event.organizer)
+        data['registrations'] = [RegistrationSerializer.for_event(reg) for reg in event.registrations]
+        data['registration_count'] = len(event.registrations)
+        return data
+    
+    @staticmethod
+    def admin_item(event, registration_count):
+        """Event row for the admin list, with the organizer's contact details."""
+        data = event.to_dict()
+        data['organizer'] = UserSerializer.contact(event.organizer)
+        data['registration_count'] = registration_count
+        return data
+
+class RegistrationSerializer:
+    """Projections of event registrations, each embedding one side only."""
+    
+    @staticmethod
+    def for_event(registration):
+        """Registration as listed under its event: the user, not the event."""
+        data = registration.to_dict()
+        data['user'] = UserSerializer.summary(registration.user)
+        return data
+    
+    @staticmethod
+    def for_user(registration):
+        """Registration as shown to its user: the event, not the user."""
+        data = registration.to_dict()
+        data['event'] = registration.event.to_dict() if registration.event else None
+        return data
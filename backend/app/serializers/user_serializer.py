@@ -0,0 +1,27 @@
+class UserSerializer:
+    """Projections of ``User`` rows embedded in other responses."""
+    
+    @staticmethod
+    def summary(user):
+        """Public view of a user, safe to show to other users."""
+        if user is None:
+            return None
+        return {
+            'id': user.id,
+            'username': user.username,
+            'full_name': user.full_name,
+            'profile_image': user.profile_image
+        }
+    
+    @staticmethod
+    def contact(user):
+        """Summary plus contact details, for organisers and admins."""
+        if user is None:
+            return None
+        data = UserSerializer.summary(user)
+        data.update({
+            'email': user.email,
+            'phone': user.phone,
+            'role': user.role
+        })
+        return data
@@ -1,3 +1,8 @@
-from .matching_service import MatchingService
+from .matching_service import MatchingService, MatchingConflict, MatchingOptions
+from .scoring_service import ScoringService
+from .job_service import JobService
+from .export_service import ExportService
+from .stats_service import StatsService
+from .event_cache_service import EventCacheService
 
-__all__ = ['MatchingService'] 
\ No newline at end of file
+__all__ = ['MatchingService', 'MatchingConflict', 'MatchingOptions', 'ScoringService', 'JobService', 'ExportService', 'StatsService', 'EventCacheService']
\ No newline at end of file
@@ -0,0 +1,71 @@
+import time
+from flask import current_app
+from app.utils.cache import get_cache
+from app.utils.conditional import is_not_modified, set_validators
+
+class EventCacheService:
+    """Encoded event list and detail responses, dropped by the writes that change them.
+    
+    Entries are keyed by a version number: one for all list pages, one per
+    event for its detail. A write replaces the version after it commits,
+    which retires the old entries at once, and a reader that loaded rows
+    from before the write can only store them under the old key.
+    """
+    
+    @staticmethod
+    def cache():
+        return get_cache('events')
+    
+    @staticmethod
+    def version(name):
+        """Return the current version of ``name``, starting one if there is none."""
+        cache = EventCacheService.cache()
+        version = cache.get(name)
+        if version is None:
+            # Clock based, so a version that was evicted is never reused
+            cache.add(name, time.time_ns(), timeout=0)
+            version = cache.get(name)
+        return version
+    
+    @staticmethod
+    def list_key(query_string):
+        return f'list:{EventCacheService.version("list-version")}:{query_string.decode()}'
+    
+    @staticmethod
+    def detail_key(event_id):
+        return f'detail:{event_id}:{EventCacheService.version(f"detail-version:{event_id}")}'
+    
+    @staticmethod
+    def cached_response(key):
+        """Answer from the cache without touching the database, or ``None`` on a miss.
+        
+        A hit whose ETag the client already has becomes a 304.
+        """
+        entry = EventCacheService.cache().get(key)
+        if entry is None:
+            return None
+        body, etag, last_modified = entry
+        if is_not_modified(etag, last_modified):
+            return set_validators(current_app.response_class(status=304), etag, last_modified)
+        response = current_app.response_class(body, mimetype='application/json')
+        return set_validators(response, etag, last_modified)
+    
+    @staticmethod
+    def store(key, response, etag, last_modified):
+        """Keep a freshly built response for the next reader."""
+        EventCacheService.cache().set(
+            key, (response.get_data(), etag, last_modified),
+            timeout=current_app.config.get('EVENT_CACHE_SECONDS', 60)
+        )
+        return response
+    
+    @staticmethod
+    def invalidate(event_id=None):
+        """Retire every list page, and the detail of ``event_id`` if given.
+        
+        Call after the write commits.
+        """
+        cache = EventCacheService.cache()
+        cache.set('list-version', time.time_ns(), timeout=0)
+        if event_id is not None:
+            cache.set(f'detail-version:{event_id}', time.time_ns(), timeout=0)
@@ -0,0 +1,117 @@
+import csv
+from datetime import date, datetime
+from io import StringIO
+from itertools import groupby
+from flask import current_app
+from sqlalchemy import select
+from app.models import DinnerRegistration, DinnerGroup, User
+from app import db
+
+# Export columns, in CSV column order
+REGISTRATION_FIELDS = [
+    'id', 'user_id', 'username', 'email', 'kota', 'budget_preference', 'tanggal_tersedia',
+    'waktu_preference', 'makanan_preference', 'min_participants', 'max_participants',
+    'status', 'gender', 'age', 'group_id', 'created_at', 'updated_at'
+]
+GROUP_FIELDS = [
+    'id', 'kota', 'budget_preference', 'tanggal', 'waktu', 'status',
+    'created_at', 'updated_at', 'member_count', 'registration_ids'
+]
+
+# Bytes of CSV/NDJSON buffered before a chunk is sent
+CHUNK_SIZE = 64 * 1024
+
+class ExportService:
+    @staticmethod
+    def stream(statement):
+        """Iterate a statement's rows as mappings through a server-side cursor.
+        
+        Rows are fetched ``EXPORT_BATCH_SIZE`` at a time, so memory stays
+        flat however many rows the export has.
+        """
+        batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        for row in result.mappings():
+            yield row
+    
+    @staticmethod
+    def registration_rows(status=None):
+        """Yield dinner registrations with their user, oldest first."""
+        statement = select(
+            DinnerRegistration.id, DinnerRegistration.user_id, User.username, User.email,
+            DinnerRegistration.kota, DinnerRegistration.budget_preference,
+            DinnerRegistration.tanggal_tersedia, DinnerRegistration.waktu_preference,
+            DinnerRegistration.makanan_preference, DinnerRegistration.min_participants,
+            DinnerRegistration.max_participants, DinnerRegistration.status,
+            DinnerRegistration.gender, DinnerRegistration.age, DinnerRegistration.group_id,
+            DinnerRegistration.created_at, DinnerRegistration.updated_at
+        ).join(User, User.id == DinnerRegistration.user_id).order_by(DinnerRegistration.id)
+        if status:
+            statement = statement.where(DinnerRegistration.status == status)
+        return ExportService.stream(statement)
+    
+    @staticmethod
+    def group_rows(status=None):
+        """Yield dinner groups with their members' registration ids.
+        
+        Groups and members come from one query ordered by group, and each
+        run of member rows is folded into its group as it streams past.
+        """
+        statement = select(
+            DinnerGroup.id, DinnerGroup.kota, DinnerGroup.budget_preference, DinnerGroup.tanggal,
+            DinnerGroup.waktu, DinnerGroup.status, DinnerGroup.created_at, DinnerGroup.updated_at,
+            DinnerRegistration.id.label('registration_id')
+        ).outerjoin(
+            DinnerRegistration, DinnerRegistration.group_id == DinnerGroup.id
+        ).order_by(DinnerGroup.id, DinnerRegistration.id)
+        if status:
+            statement = statement.where(DinnerGroup.status == status)
+        
+        for _, rows in groupby(ExportService.stream(statement), key=lambda row: row['id']):
+            rows = list(rows)
+            group = {field: rows[0][field] for field in GROUP_FIELDS if field in rows[0]}
+            group['registration_ids'] = [
+                row['registration_id'] for row in rows if row['registration_id'] is not None
+            ]
+            group['member_count'] = len(group['registration_ids'])
+            yield group
+    
+    @staticmethod
+    def plain(value):
+        """Make a column value CSV friendly, matching the API's date format."""
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return value
+    
+    @staticmethod
+    def to_ndjson(rows, fields):
+        """Encode rows as newline-delimited JSON, in chunks."""
+        buffer = []
+        size = 0
+        for row in rows:
+            line = current_app.json.dumps({field: row[field] for field in fields}) + '\n'
+            buffer.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer)
+    
+    @staticmethod
+    def to_csv(rows, fields):
+        """Encode rows as CSV with a header line, in chunks."""
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow([
+                ';'.join(map(str, value)) if isinstance(value, list) else ExportService.plain(value)
+                for value in (row[field] for field in fields)
+            ])
+            if buffer.tell() >= CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
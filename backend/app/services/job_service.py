@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+import time
+import traceback
+from flask import current_app
+from sqlalchemy import select, update
+from app.models import MatchingJob
+from app import db
+from .matching_service import MatchingService
+
+# Job kinds and the steps they run, in order
+JOB_STEPS = {
+    'match': ('match',),
+    'cleanup': ('cleanup',),
+    'match_and_cleanup': ('match', 'cleanup')
+}
+
+class JobService:
+    @staticmethod
+    def enqueue(kind, params=None, requested_by=None):
+        """Queue a matching job, or return the identical job already queued."""
+        if kind not in JOB_STEPS:
+            raise ValueError(f'Unknown job kind: {kind}')
+        # Drop empty options so equivalent requests compare equal
+        params = {key: value for key, value in (params or {}).items() if value}
+        
+        queued = MatchingJob.query.filter_by(kind=kind, status='queued').all()
+        for job in queued:
+            if job.params == params:
+                return job
+        
+        job = MatchingJob(kind, params, requested_by)
+        db.session.add(job)
+        db.session.commit()
+        return job
+    
+    @staticmethod
+    def claim_next():
+        """Claim the oldest queued job for this worker, or return ``None``.
+        
+        PostgreSQL skips jobs other workers have locked; everywhere the
+        guarded status update makes sure only one worker starts a job.
+        """
+        while True:
+            query = select(MatchingJob.id).where(
+                MatchingJob.status == 'queued'
+            ).order_by(MatchingJob.created_at, MatchingJob.id).limit(1)
+            if db.session.get_bind().dialect.name == 'postgresql':
+                query = query.with_for_update(skip_locked=True)
+            job_id = db.session.scalar(query)
+            if job_id is None:
+                db.session.commit()
+                return None
+            
+            claimed = db.session.execute(
+                update(MatchingJob).where(
+                    MatchingJob.id == job_id,
+                    MatchingJob.status == 'queued'
+                ).values(status='running', started_at=datetime.utcnow()).execution_options(
+                    synchronize_session=False
+                )
+            )
+            db.session.commit()
+            if claimed.rowcount:
+                return db.session.get(MatchingJob, job_id, populate_existing=True)
+    
+    @staticmethod
+    def run(job):
+        """Run a claimed job's steps and record the result or the error."""
+        result = {}
+        try:
+            for step in JOB_STEPS[job.kind]:
+                if step == 'match':
+                    groups = MatchingService.match_registrations(job.params.get('kota') or None)
+                    result['groups_formed'] = len(groups)
+                elif step == 'cleanup':
+                    result['cleaned_up_registrations'] = MatchingService.cleanup_old_registrations()
+        except Exception:
+            db.session.rollback()
+            job.status = 'failed'
+            job.error = traceback.format_exc()
+            current_app.logger.exception('Matching job %s failed', job.id)
+        else:
+            job.status = 'succeeded'
+        job.result = result
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        current_app.logger.info('Matching job %s (%s) %s in %.2fs', job.id, job.kind, job.status, job.duration)
+        return job
+    
+    @staticmethod
+    def run_pending(limit=None):
+        """Run queued jobs until there are none left (or ``limit`` ran)."""
+        jobs = []
+        while limit is None or len(jobs) < limit:
+            job = JobService.claim_next()
+            if job is None:
+                break
+            jobs.append(JobService.run(job))
+        return jobs
+    
+    @staticmethod
+    def schedule_due():
+        """Queue the periodic matching job when ``MATCHING_SCHEDULE_SECONDS`` have passed.
+        
+        The interval is measured from the last scheduled job, so several
+        workers polling the same database queue it once.
+        """
+        interval = current_app.config.get('MATCHING_SCHEDULE_SECONDS', 0)
+        if not interval:
+            return None
+        
+        last = MatchingJob.query.filter(
+            MatchingJob.requested_by.is_(None)
+        ).order_by(MatchingJob.created_at.desc()).first()
+        if last and last.created_at > datetime.utcnow() - timedelta(seconds=interval):
+            return None
+        return JobService.enqueue('match_and_cleanup')
+    
+    @staticmethod
+    def fail_stale_jobs():
+        """Mark jobs running for longer than ``MATCHING_JOB_TIMEOUT`` as failed.
+        
+        Covers workers that died mid-job, so their jobs do not look
+        running forever.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=current_app.config.get('MATCHING_JOB_TIMEOUT', 3600))
+        stale = db.session.execute(
+            update(MatchingJob).where(
+                MatchingJob.status == 'running',
+                MatchingJob.started_at < cutoff
+            ).values(
+                status='failed', error='Timed out', finished_at=datetime.utcnow()
+            ).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return stale.rowcount
+    
+    @staticmethod
+    def work(poll_interval=None, once=False):
+        """Worker loop: queue scheduled jobs and run everything queued.
+        
+        With ``once`` the queue is drained a single time, which suits a
+        cron-driven worker; otherwise it polls every ``poll_interval``
+        seconds (``MATCHING_WORKER_POLL_SECONDS`` by default).
+        """
+        poll_interval = poll_interval or current_app.config.get('MATCHING_WORKER_POLL_SECONDS', 10)
+        while True:
+            JobService.fail_stale_jobs()
+            JobService.schedule_due()
+            jobs = JobService.run_pending()
+            if once:
+                return jobs
+            # Release the connection between polls
+            db.session.remove()
+            time.sleep(poll_interval)
@@ -1,89 +1,745 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from heapq import heappop, heappush
+import math
+import os
+import time
+from flask import current_app
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models import DinnerRegistration, DinnerGroup
 from app import db
+from app.utils.query_counter import count_queries
+from .scoring_service import ScoringService
+from .stats_service import StatsService
+
+# Plain, picklable view of a pending registration used by the matcher
+PendingRegistration = namedtuple('PendingRegistration', [
+    'id', 'kota', 'budget_preference', 'tanggal_tersedia', 'waktu_preference',
+    'makanan_preference', 'makanan_tags', 'min_participants', 'max_participants', 'gender', 'age'
+])
+
+# Planner options, picklable so they can be shipped to worker processes
+MatchingOptions = namedtuple('MatchingOptions', [
+    'strategy', 'date_tolerance', 'slot_tolerance', 'food_mode', 'max_group_size'
+], defaults=['fifo', 0, 0, 'prefer', 12])
+
+# Time slots in chronological order, used to find adjacent slots
+WAKTU_SLOTS = ['sore', 'malam', 'malam_larut']
+
+# Group ids per verification query, below SQLite's bound-parameter limit
+VERIFY_CHUNK_SIZE = 5000
+
+# Pending rows fetched and locked per online match, and per seat refilled
+# by a group repair, unless configured
+CANDIDATE_WINDOW = 50
+REPAIR_WINDOW = 5
+
+# States the packing search explores before it only tries the most groups
+PACKING_NODE_BUDGET = 20000
+
+class MatchingConflict(Exception):
+    """Raised when planned registrations were claimed by another matcher."""
 
 class MatchingService:
     @staticmethod
-    def find_compatible_registrations(registration):
-        """Find compatible registrations for a given registration."""
-        # Get registrations with matching criteria
-        compatible = DinnerRegistration.query.filter(
+    def bucket_key(registration):
+        """Return the key registrations must share to be matched together."""
+        return (
+            registration.kota,
+            registration.budget_preference,
+            registration.tanggal_tersedia,
+            registration.waktu_preference
+        )
+    
+    @staticmethod
+    def snapshot(registration):
+        """Return the ``PendingRegistration`` view of a registration."""
+        return PendingRegistration(*(getattr(registration, field) for field in PendingRegistration._fields))
+    
+    @staticmethod
+    def options(strategy=None):
+        """Return the configured ``MatchingOptions``, optionally overriding the strategy."""
+        config = current_app.config
+        return MatchingOptions(
+            strategy=strategy or config.get('MATCHING_STRATEGY', 'fifo'),
+            date_tolerance=config.get('MATCHING_DATE_TOLERANCE_DAYS', 0),
+            slot_tolerance=config.get('MATCHING_SLOT_TOLERANCE', 0),
+            food_mode=config.get('MATCHING_FOOD_MODE', 'prefer'),
+            max_group_size=config.get('MATCHING_MAX_GROUP_SIZE', 12)
+        )
+    
+    @staticmethod
+    def nearby_slots(waktu, slot_tolerance):
+        """Return the slots within ``slot_tolerance`` steps of ``waktu``."""
+        if waktu not in WAKTU_SLOTS:
+            return [waktu]
+        position = WAKTU_SLOTS.index(waktu)
+        return WAKTU_SLOTS[max(0, position - slot_tolerance):position + slot_tolerance + 1]
+    
+    @staticmethod
+    def claim(query):
+        """Lock the rows a query returns, skipping rows other matchers hold.
+        
+        PostgreSQL uses ``FOR UPDATE SKIP LOCKED`` so concurrent matchers
+        work on disjoint rows without waiting on each other. Other backends
+        (SQLite in tests) have no row locks and rely on the guarded update
+        in ``create_groups`` instead.
+        """
+        if db.session.get_bind().dialect.name == 'postgresql':
+            return query.with_for_update(skip_locked=True, of=DinnerRegistration)
+        return query
+    
+    @staticmethod
+    def find_bucket_candidates(registration, limit, options=MatchingOptions()):
+        """Fetch the oldest pending registrations in the same bucket.
+        
+        The lookup is served by the bucket index and bounded by ``limit``,
+        so its cost does not grow with the size of the pending pool. With
+        tolerances it becomes a range scan over nearby dates and slots, and
+        with ``food_mode='enforce'`` only the same food tags qualify.
+        """
+        date_tolerance, slot_tolerance = options.date_tolerance, options.slot_tolerance
+        query = DinnerRegistration.query.filter(
             DinnerRegistration.id != registration.id,
             DinnerRegistration.status == 'pending',
             DinnerRegistration.kota == registration.kota,
-            DinnerRegistration.budget_preference == registration.budget_preference,
-            DinnerRegistration.tanggal_tersedia == registration.tanggal_tersedia,
-            DinnerRegistration.waktu_preference == registration.waktu_preference
-        ).all()
+            DinnerRegistration.budget_preference == registration.budget_preference
+        )
+        if date_tolerance:
+            query = query.filter(DinnerRegistration.tanggal_tersedia.between(
+                registration.tanggal_tersedia - timedelta(days=date_tolerance),
+                registration.tanggal_tersedia + timedelta(days=date_tolerance)
+            ))
+        else:
+            query = query.filter(DinnerRegistration.tanggal_tersedia == registration.tanggal_tersedia)
+        if slot_tolerance:
+            query = query.filter(DinnerRegistration.waktu_preference.in_(
+                MatchingService.nearby_slots(registration.waktu_preference, slot_tolerance)
+            ))
+        else:
+            query = query.filter(DinnerRegistration.waktu_preference == registration.waktu_preference)
+        if options.food_mode == 'enforce':
+            query = query.filter(DinnerRegistration.makanan_tags == registration.makanan_tags)
         
-        return compatible
+        query = query.order_by(DinnerRegistration.created_at, DinnerRegistration.id).limit(limit)
+        return MatchingService.claim(query).all()
     
     @staticmethod
-    def create_group(registrations):
-        """Create a new dinner group from compatible registrations."""
-        if not registrations:
+    def match_registration(registration):
+        """Try to form a group around a newly arrived registration.
+        
+        A bounded window of the oldest pending registrations in the same
+        bucket is packed together with the new one, and every group that
+        can be formed from it is created. Returns the new registration's
+        group, if it got one.
+        """
+        if registration.status != 'pending':
             return None
         
-        # Use the first registration's details for the group
-        first_reg = registrations[0]
-        group = DinnerGroup(
-            kota=first_reg.kota,
-            budget_preference=first_reg.budget_preference,
-            tanggal=first_reg.tanggal_tersedia,
-            waktu=first_reg.waktu_preference
+        options = MatchingService.options()
+        # A fixed window, whatever the registration's size limits ask for
+        candidates = MatchingService.find_bucket_candidates(
+            registration, current_app.config.get('MATCHING_CANDIDATE_WINDOW', CANDIDATE_WINDOW), options
         )
         
-        db.session.add(group)
-        db.session.flush()  # Get the group ID
+        # Form a group as soon as enough compatible registrations exist
+        if len(candidates) + 1 < registration.min_participants:
+            return None
         
-        # Update registrations
-        for reg in registrations:
-            reg.group_id = group.id
-            reg.status = 'matched'
+        # Nearby candidates join at the new registration's date and slot
+        pool = [
+            MatchingService.snapshot(reg)._replace(
+                tanggal_tersedia=registration.tanggal_tersedia,
+                waktu_preference=registration.waktu_preference
+            )
+            for reg in candidates + [registration]
+        ]
+        planned_groups = MatchingService.form_bucket_groups(pool, options)
+        if not planned_groups:
+            # Release the candidates claimed for this attempt
+            db.session.commit()
+            return None
         
+        try:
+            groups = MatchingService.create_groups(planned_groups)
+        except MatchingConflict:
+            # Another matcher took some of them, the batch run will retry
+            return None
+        
+        for group, group_registrations in zip(groups, planned_groups):
+            if any(reg.id == registration.id for reg in group_registrations):
+                return group
+        return None
+    
+    @staticmethod
+    def repair_group(registration):
+        """Remove a cancelled member from its group and repair the group.
+        
+        The freed seat is refilled from the pending registrations in the
+        same bucket. The group is only dissolved, sending its members back
+        to pending, when it falls below its members' ``min_participants``.
+        Returns the group, or ``None`` when it was dissolved.
+        """
+        group = registration.group
+        members = [reg for reg in group.registrations if reg.id != registration.id]
+        registration.group_id = None
+        registration.status = 'cancelled'
+        
+        size = len(members) + 1
+        if members and size <= min(reg.max_participants for reg in members):
+            # Look around the group's own date and slot
+            template = MatchingService.snapshot(registration)._replace(
+                tanggal_tersedia=group.tanggal, waktu_preference=group.waktu
+            )
+            options = MatchingService.options()
+            if options.food_mode == 'enforce':
+                # Members share their tags, so the replacement must carry them too
+                template = template._replace(makanan_tags=members[0].makanan_tags)
+            candidates = MatchingService.find_bucket_candidates(
+                template,
+                current_app.config.get('MATCHING_REPAIR_WINDOW', REPAIR_WINDOW),
+                options
+            )
+            # The replacement's own size limits must allow the repaired group
+            candidates = [
+                reg for reg in candidates
+                if reg.min_participants <= size <= reg.max_participants
+            ]
+            if options.strategy == 'scored':
+                candidates = ScoringService.pick_best(members, candidates, 1)
+            
+            for candidate in candidates[:1]:
+                # Only take the replacement if no other matcher has claimed it
+                claimed = db.session.execute(
+                    update(DinnerRegistration).where(
+                        DinnerRegistration.id == candidate.id,
+                        DinnerRegistration.status == 'pending',
+                        DinnerRegistration.group_id.is_(None)
+                    ).values(group_id=group.id, status='matched').execution_options(
+                        synchronize_session=False
+                    )
+                )
+                if claimed.rowcount:
+                    # Tell the session what the row now holds, so a dissolve below resets it
+                    set_committed_value(candidate, 'status', 'matched')
+                    set_committed_value(candidate, 'group_id', group.id)
+                    members.append(candidate)
+                    StatsService.bump({
+                        'dinner_registrations:pending': -1,
+                        'dinner_registrations:matched': 1
+                    })
+        
+        if members and len(members) >= max(reg.min_participants for reg in members):
+            db.session.commit()
+            return group
+        
+        # Dissolve the group
+        for reg in members:
+            reg.status = 'pending'
+            reg.group_id = None
+        db.session.delete(group)
         db.session.commit()
-        return group
+        return None
     
     @staticmethod
-    def match_registrations():
-        """Match pending registrations into groups."""
-        # Get all pending registrations
-        pending_registrations = DinnerRegistration.query.filter_by(
-            status='pending'
-        ).order_by(DinnerRegistration.created_at).all()
+    def load_pending_pool(kota=None, claim=True):
+        """Load and claim every pending registration in a single query, oldest first.
+        
+        Only the columns the matcher needs are selected, as plain
+        ``PendingRegistration`` tuples that can be shipped to worker processes.
+        ``kota`` restricts the pool to some cities so several matchers can
+        run on disjoint buckets at the same time. ``claim=False`` reads the
+        pool without locking it.
+        """
+        query = db.session.query(
+            *(getattr(DinnerRegistration, field) for field in PendingRegistration._fields)
+        ).filter(
+            DinnerRegistration.status == 'pending'
+        ).order_by(DinnerRegistration.created_at, DinnerRegistration.id)
+        if kota:
+            query = query.filter(DinnerRegistration.kota.in_(kota))
+        if claim:
+            query = MatchingService.claim(query)
+        return [PendingRegistration(*row) for row in query]
+    
+    @staticmethod
+    def bucket_registrations(registrations):
+        """Group registrations by their bucket key, keeping their order."""
+        buckets = defaultdict(list)
+        for reg in registrations:
+            buckets[MatchingService.bucket_key(reg)].append(reg)
+        return buckets
+    
+    @staticmethod
+    def packable_from(low, high):
+        """Return a count from which every count splits into group sizes within ``[low, high]``.
+        
+        ``g`` groups hold ``g * low`` to ``g * high`` members, and these
+        ranges meet once ``g >= (low - 1) / (high - low)``. With
+        ``low == high`` only multiples split, and 0 is returned.
+        """
+        if low == high:
+            return 0
+        return math.ceil((low - 1) / (high - low)) * low
+    
+    @staticmethod
+    def pack_bucket(bucket, max_group_size=12):
+        """Choose which registrations of a bucket to place, in groups of which sizes.
+        
+        Places as many registrations as fit in groups whose size lies in
+        every member's window, oldest first within a window type. Returns
+        ``(members, sizes)`` pairs with members in arrival order and
+        ``sum(sizes) == len(members)``.
+        """
+        by_type = defaultdict(list)
+        for i, reg in enumerate(bucket):
+            low, high = reg.min_participants, min(reg.max_participants, max_group_size)
+            if 1 <= low <= high:
+                by_type[(low, high)].append(i)
+        if not by_type:
+            return []
+        top = max(high for _, high in by_type)
+        
+        # Large window types give up whole groups of their largest size up
+        # front, keeping enough members that the rest still splits
+        # (packable_from) plus the largest size as spare for other types.
+        # The search then sees a bounded number of members per type, so the
+        # cost stays linear in the bucket.
+        plans = []
+        # waiting[high]: (low, index) of the members left for the search
+        waiting = [[] for _ in range(top + 1)]
+        for (low, high), members in by_type.items():
+            keep = MatchingService.packable_from(low, high) + top
+            groups = max(0, (len(members) - keep) // high)
+            if groups:
+                plans.append(([bucket[i] for i in members[:groups * high]], [high] * groups))
+            waiting[high].extend((low, i) for i in members[groups * high:])
+        
+        # entering[s][low]: members whose largest size is s, by smallest size
+        entering = [[0] * (top + 1) for _ in range(top + 1)]
+        for high, members in enumerate(waiting):
+            for low, _ in members:
+                entering[high][low] += 1
+        # later[s]: members whose largest size is below s
+        later = [0] * (top + 1)
+        for s in range(1, top + 1):
+            later[s] = later[s - 1] + len(waiting[s - 1])
+        
+        def fill(counts, taken):
+            """Take ``taken`` members, highest smallest size first."""
+            rest = list(counts)
+            low = len(rest) - 1
+            while taken:
+                used = min(taken, rest[low])
+                rest[low] -= used
+                taken -= used
+                low -= 1
+            return rest
+        
+        # Sizes are decided from the largest down. At size s the groups take
+        # the members accepting s whose smallest size is highest, as they run
+        # out of sizes first; that fills any number of groups per size
+        # optimally, so only the number of groups per size is searched. The
+        # search stops once everything left is placed, and past
+        # PACKING_NODE_BUDGET states only tries the most groups, so unusual
+        # mixes of many windows can fall short of the optimum.
+        # best[(s, left)]: (most placed at sizes s and below, groups of size s),
+        # where left[low] counts the unplaced members accepting s + 1
+        best = {}
+        
+        def search(s, left):
+            if s == 0:
+                return 0
+            if (s, left) in best:
+                return best[(s, left)][0]
+            counts = [carried + entering[s][low] for low, carried in enumerate(left)]
+            total = sum(counts)
+            ceiling = total + later[s]
+            # Groups of members that cannot wait for a smaller size cost nothing
+            choices = range(total // s, counts[s] // s - 1, -1)
+            if len(best) > PACKING_NODE_BUDGET:
+                choices = [total // s]
+            result = (-1, 0)
+            for groups in choices:
+                placed = groups * s + search(s - 1, tuple(fill(counts, groups * s)[:s]))
+                if placed > result[0]:
+                    result = (placed, groups)
+                if placed == ceiling:
+                    break
+            best[(s, left)] = result
+            return result[0]
+        
+        search(top, (0,) * (top + 1))
+        
+        # Replay the chosen group counts, oldest members first within a smallest size
+        queues = [[] for _ in range(top + 1)]
+        for s in range(top, 0, -1):
+            groups = best[(s, tuple(len(queue) for queue in queues[:s + 1]))][1]
+            for low, i in waiting[s]:
+                heappush(queues[low], i)
+            members = []
+            low = s
+            while len(members) < groups * s:
+                if queues[low]:
+                    members.append(heappop(queues[low]))
+                else:
+                    low -= 1
+            if members:
+                members.sort()
+                plans.append(([bucket[i] for i in members], [s] * groups))
+            # Whoever needs at least s is out of sizes
+            queues[s] = []
+        
+        return plans
+    
+    @staticmethod
+    def food_partitions(bucket, food_mode='prefer'):
+        """Split a bucket into the parts whose members may share a group.
+        
+        With ``food_mode='enforce'`` registrations are indexed by their food
+        tag bitmask, so every member of a group carries the same dietary
+        constraints; otherwise the bucket is one part and food only counts
+        towards the compatibility score.
+        """
+        if food_mode != 'enforce':
+            return [bucket]
+        by_tags = defaultdict(list)
+        for reg in bucket:
+            by_tags[reg.makanan_tags or 0].append(reg)
+        return list(by_tags.values())
+    
+    @staticmethod
+    def form_bucket_groups(bucket, options=MatchingOptions()):
+        """Split one bucket into groups that respect every member's size limits.
         
-        matched_groups = []
+        ``pack_bucket`` decides which registrations are placed and the group
+        sizes; the ``'fifo'`` strategy then fills groups in arrival order
+        and ``'scored'`` fills them by compatibility.
+        """
+        groups = []
+        for part in MatchingService.food_partitions(bucket, options.food_mode):
+            for members, sizes in MatchingService.pack_bucket(part, options.max_group_size):
+                if options.strategy == 'scored':
+                    groups.extend(ScoringService.partition(members, sizes))
+                    continue
+                start = 0
+                for size in sizes:
+                    groups.append(members[start:start + size])
+                    start += size
+        return groups
+    
+    @staticmethod
+    def plan_pool(registrations, options=MatchingOptions()):
+        """Plan the groups for a pool of ``PendingRegistration`` tuples.
         
-        for reg in pending_registrations:
-            if reg.status != 'pending':
+        Exact buckets are matched first. With tolerances, what is left of
+        each bucket is then offered to its neighbours by ``plan_nearby``.
+        """
+        planned_groups = []
+        leftovers = {}
+        for key, bucket in MatchingService.bucket_registrations(registrations).items():
+            groups = MatchingService.form_bucket_groups(bucket, options)
+            planned_groups.extend(groups)
+            if options.date_tolerance or options.slot_tolerance:
+                placed = {reg.id for group_registrations in groups for reg in group_registrations}
+                rest = [reg for reg in bucket if reg.id not in placed]
+                if rest:
+                    leftovers[key] = rest
+        
+        if leftovers:
+            planned_groups.extend(MatchingService.plan_nearby(leftovers, options))
+        return planned_groups
+    
+    @staticmethod
+    def plan_nearby(leftovers, options):
+        """Match unplaced registrations across nearby dates and time slots.
+        
+        ``leftovers`` maps bucket keys to their unplaced registrations. A
+        sorted index of bucket dates per (kota, budget_preference) finds
+        the neighbours of a bucket with two binary searches, so no pairs of
+        buckets are ever compared. Buckets are taken largest first as
+        anchors; their neighbours' registrations join them at the anchor's
+        date and slot, which is within every member's tolerance.
+        """
+        date_tolerance, slot_tolerance = options.date_tolerance, options.slot_tolerance
+        entries = defaultdict(list)
+        for key in leftovers:
+            kota, budget_preference, tanggal, waktu = key
+            entries[(kota, budget_preference)].append((tanggal.toordinal(), key))
+        # (kota, budget_preference) -> (sorted date ordinals, bucket keys in that order)
+        index = {}
+        for city_budget, dated in entries.items():
+            dated.sort(key=lambda entry: entry[0])
+            index[city_budget] = ([ordinal for ordinal, _ in dated], [key for _, key in dated])
+        
+        planned_groups = []
+        anchors = sorted(leftovers, key=lambda key: len(leftovers[key]), reverse=True)
+        for anchor in anchors:
+            if not leftovers[anchor]:
                 continue
+            kota, budget_preference, tanggal, waktu = anchor
+            ordinals, keys = index[(kota, budget_preference)]
+            start = bisect_left(ordinals, tanggal.toordinal() - date_tolerance)
+            end = bisect_right(ordinals, tanggal.toordinal() + date_tolerance)
+            slots = MatchingService.nearby_slots(waktu, slot_tolerance)
             
-            # Find compatible registrations
-            compatible = MatchingService.find_compatible_registrations(reg)
+            neighbours = [key for key in keys[start:end] if key[3] in slots and leftovers[key]]
+            if len(neighbours) < 2:
+                continue
+            pool = sorted(
+                (reg._replace(tanggal_tersedia=tanggal, waktu_preference=waktu)
+                 for key in neighbours for reg in leftovers[key]),
+                key=lambda reg: reg.id
+            )
             
-            # Check if we have enough compatible registrations
-            if len(compatible) >= reg.min_participants - 1:
-                # Create a group with this registration and its compatible ones
-                group_registrations = [reg] + compatible[:reg.max_participants - 1]
-                group = MatchingService.create_group(group_registrations)
-                if group:
-                    matched_groups.append(group)
+            groups = MatchingService.form_bucket_groups(pool, options)
+            planned_groups.extend(groups)
+            placed = {reg.id for group_registrations in groups for reg in group_registrations}
+            for key in neighbours:
+                leftovers[key] = [reg for reg in leftovers[key] if reg.id not in placed]
+        
+        return planned_groups
+    
+    @staticmethod
+    def create_group(registrations):
+        """Create a new dinner group from compatible registrations."""
+        if not registrations:
+            return None
+        
+        return MatchingService.create_groups([registrations])[0]
+    
+    @staticmethod
+    def create_groups(groups_registrations):
+        """Persist many groups with bulk statements in one transaction.
+        
+        On PostgreSQL all groups are inserted with one batched statement;
+        other backends (SQLite in tests) have no insert sentinel for the
+        ordered ``RETURNING`` and fall back to one INSERT per group. All
+        members are updated with one executemany statement, and the run is
+        rolled back as a whole on failure.
+        Members are only updated while still pending and unassigned; if any
+        of them was claimed by another matcher meanwhile the whole run is
+        rolled back and ``MatchingConflict`` is raised.
+        """
+        groups_registrations = [regs for regs in groups_registrations if regs]
+        if not groups_registrations:
+            # Release any rows claimed for this run
+            db.session.commit()
+            return []
+        
+        # Use the first registration's details for each group
+        group_rows = []
+        for regs in groups_registrations:
+            first_reg = regs[0]
+            group_rows.append({
+                'kota': first_reg.kota,
+                'budget_preference': first_reg.budget_preference,
+                'tanggal': first_reg.tanggal_tersedia,
+                'waktu': first_reg.waktu_preference,
+                'status': 'active'
+            })
+        
+        try:
+            groups = db.session.scalars(
+                insert(DinnerGroup).returning(DinnerGroup, sort_by_parameter_order=True),
+                group_rows
+            ).all()
+            
+            # Update registrations by primary key, guarded against double assignment
+            registration_rows = [
+                {'id': reg.id, 'group_id': group.id, 'status': 'matched'}
+                for group, regs in zip(groups, groups_registrations)
+                for reg in regs
+            ]
+            db.session.execute(
+                update(DinnerRegistration).where(
+                    DinnerRegistration.status == 'pending',
+                    DinnerRegistration.group_id.is_(None)
+                ).execution_options(synchronize_session=None),
+                registration_rows
+            )
+            
+            group_ids = [group.id for group in groups]
+            claimed = sum(
+                db.session.query(func.count(DinnerRegistration.id)).filter(
+                    DinnerRegistration.group_id.in_(group_ids[i:i + VERIFY_CHUNK_SIZE])
+                ).scalar()
+                for i in range(0, len(group_ids), VERIFY_CHUNK_SIZE)
+            )
+            if claimed != len(registration_rows):
+                raise MatchingConflict('Registrations were claimed by another matching run')
+            
+            # Bulk statements skip the session events that maintain the counters
+            StatsService.bump({
+                'dinner_groups': len(groups),
+                'dinner_groups:active': len(groups),
+                'dinner_registrations:pending': -claimed,
+                'dinner_registrations:matched': claimed
+            })
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        return groups
+    
+    @staticmethod
+    def shard_key(registration, shard_by='kota'):
+        """Return the shard a registration is solved in by parallel matching."""
+        if shard_by == 'bucket':
+            return MatchingService.bucket_key(registration)
+        return registration.kota
+    
+    @staticmethod
+    def solve_shard(registrations, options=MatchingOptions()):
+        """Plan the groups for one shard.
         
-        return matched_groups
+        Runs in worker processes, so it only touches the plain tuples it is
+        given and never the database.
+        """
+        return MatchingService.plan_pool(registrations, options)
+    
+    @staticmethod
+    def plan_groups_parallel(registrations, options, workers, shard_by='kota'):
+        """Plan groups by solving independent shards on a process pool.
+        
+        Nearby-slot matching needs neighbouring buckets in the same shard,
+        so it always shards by city.
+        """
+        if options.date_tolerance or options.slot_tolerance:
+            shard_by = 'kota'
+        shards = defaultdict(list)
+        for reg in registrations:
+            shards[MatchingService.shard_key(reg, shard_by)].append(reg)
+        
+        planned_groups = []
+        # The pool forks every worker up front, so never start more than can be used
+        workers = max(1, min(workers, len(shards), os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(MatchingService.solve_shard, shard, options)
+                for shard in shards.values()
+            ]
+            # Merge in submission order so runs are deterministic
+            for future in futures:
+                planned_groups.extend(future.result())
+        return planned_groups
+    
+    @staticmethod
+    def plan_groups(registrations, strategy=None, workers=None, shard_by=None):
+        """Plan groups for a pending pool without touching the database.
+        
+        Options left as ``None`` come from the ``MATCHING_*`` config.
+        """
+        config = current_app.config
+        options = MatchingService.options(strategy)
+        workers = workers or config.get('MATCHING_WORKERS', 1)
+        shard_by = shard_by or config.get('MATCHING_SHARD_BY', 'kota')
+        
+        if workers > 1:
+            return MatchingService.plan_groups_parallel(registrations, options, workers, shard_by)
+        return MatchingService.plan_pool(registrations, options)
+    
+    @staticmethod
+    def match_registrations(kota=None):
+        """Match pending registrations into groups."""
+        # Load the whole pending pool once and bucket it in memory
+        pending_registrations = MatchingService.load_pending_pool(kota)
+        
+        # Plan every group before writing them in a single transaction
+        planned_groups = MatchingService.plan_groups(pending_registrations)
+        return MatchingService.create_groups(planned_groups)
+    
+    @staticmethod
+    def simulate_matching(kota=None, strategy=None, workers=None, shard_by=None):
+        """Dry-run matching and report what a real run would do.
+        
+        The pool is read without locks and nothing is written. Returns the
+        proposed groups (as registration ids) with quality and cost metrics:
+        groups formed, match rate and unmatched count per bucket, wall time
+        and SQL statements issued.
+        """
+        started = time.perf_counter()
+        with count_queries(db.engine, this_thread=True) as counter:
+            pending_registrations = MatchingService.load_pending_pool(kota, claim=False)
+            planned_groups = MatchingService.plan_groups(
+                pending_registrations, strategy, workers, shard_by
+            )
+        wall_time = time.perf_counter() - started
+        
+        # Count members in their own bucket, not the one they were matched at
+        buckets_by_key = MatchingService.bucket_registrations(pending_registrations)
+        bucket_of = {reg.id: key for key, bucket in buckets_by_key.items() for reg in bucket}
+        matched = defaultdict(int)
+        for group_registrations in planned_groups:
+            for reg in group_registrations:
+                matched[bucket_of[reg.id]] += 1
+        
+        buckets = []
+        for key, bucket in buckets_by_key.items():
+            city, budget_preference, tanggal, waktu = key
+            buckets.append({
+                'kota': city,
+                'budget_preference': budget_preference,
+                'tanggal': tanggal.isoformat() if tanggal else None,
+                'waktu': waktu,
+                'pending': len(bucket),
+                'matched': matched[key],
+                'unmatched': len(bucket) - matched[key],
+                'match_rate': matched[key] / len(bucket)
+            })
+        
+        total_matched = sum(matched.values())
+        return {
+            'groups_formed': len(planned_groups),
+            'pending': len(pending_registrations),
+            'matched': total_matched,
+            'unmatched': len(pending_registrations) - total_matched,
+            'match_rate': total_matched / len(pending_registrations) if pending_registrations else 0.0,
+            'wall_time': wall_time,
+            'queries': counter.count,
+            'buckets': buckets,
+            'groups': [[reg.id for reg in regs] for regs in planned_groups]
+        }
     
     @staticmethod
     def cleanup_old_registrations():
-        """Clean up old pending registrations."""
+        """Clean up old pending registrations.
+        
+        Stale rows are cancelled with set-based UPDATE ... RETURNING
+        statements in chunks of ``CLEANUP_BATCH_SIZE``, committing after
+        each chunk so a large backlog never holds a long lock.
+        """
         # Find registrations older than 7 days
         cutoff_date = datetime.utcnow() - timedelta(days=7)
-        old_registrations = DinnerRegistration.query.filter(
-            DinnerRegistration.status == 'pending',
-            DinnerRegistration.created_at < cutoff_date
-        ).all()
-        
-        # Update their status to cancelled
-        for reg in old_registrations:
-            reg.status = 'cancelled'
+        batch_size = current_app.config.get('CLEANUP_BATCH_SIZE', 1000)
         
-        db.session.commit()
-        return len(old_registrations) 
\ No newline at end of file
+        cleaned_up = 0
+        while True:
+            chunk = MatchingService.claim(
+                select(DinnerRegistration.id).where(
+                    DinnerRegistration.status == 'pending',
+                    DinnerRegistration.created_at < cutoff_date
+                ).limit(batch_size)
+            ).scalar_subquery()
+            
+            # Update their status to cancelled
+            cancelled = db.session.execute(
+                update(DinnerRegistration).where(
+                    DinnerRegistration.id.in_(chunk)
+                ).values(status='cancelled').returning(
+                    DinnerRegistration.id
+                ).execution_options(synchronize_session=False)
+            ).all()
+            StatsService.bump({
+                'dinner_registrations:pending': -len(cancelled),
+                'dinner_registrations:cancelled': len(cancelled)
+            })
+            db.session.commit()
+            
+            cleaned_up += len(cancelled)
+            if len(cancelled) < batch_size:
+                return cleaned_up
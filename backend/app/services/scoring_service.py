@@ -0,0 +1,133 @@
+import numpy as np
+from app.utils.food_tags import FOOD_TAGS
+
+class ScoringService:
+    """Compatibility scoring for registrations that share a matching bucket."""
+    
+    AGE_WEIGHT = 1.0     # Penalty per (10 years of age gap) squared
+    GENDER_WEIGHT = 0.5  # Bonus for pairing different genders
+    FOOD_WEIGHT = 1.0    # Bonus for shared food tags
+    
+    @staticmethod
+    def build_features(registrations):
+        """Build the per-bucket feature matrices.
+        
+        Returns ``(ages, genders, foods)``: ages in decades (missing ages take
+        the bucket mean), a one-hot gender matrix and the L2-normalised
+        bits of the food tag masks.
+        """
+        n = len(registrations)
+        
+        ages = np.array([reg.age if reg.age else np.nan for reg in registrations], dtype=np.float64)
+        known = ~np.isnan(ages)
+        ages[~known] = ages[known].mean() if known.any() else 0.0
+        ages /= 10.0
+        
+        gender_vocab = {}
+        gender_cols = []
+        for row, reg in enumerate(registrations):
+            if reg.gender:
+                gender_cols.append((row, gender_vocab.setdefault(reg.gender.lower(), len(gender_vocab))))
+        
+        genders = np.zeros((n, max(len(gender_vocab), 1)))
+        for row, col in gender_cols:
+            genders[row, col] = 1.0
+        
+        # Unpack the tag bitmasks; dot products then count shared tags
+        masks = np.array([reg.makanan_tags or 0 for reg in registrations], dtype=np.int64)
+        foods = ((masks[:, None] >> np.arange(len(FOOD_TAGS))) & 1).astype(np.float64)
+        norms = np.linalg.norm(foods, axis=1, keepdims=True)
+        np.divide(foods, norms, out=foods, where=norms > 0)
+        
+        return ages, genders, foods
+    
+    @staticmethod
+    def pair_matrices(registrations):
+        """Factor the pairwise score into two matrices ``left`` and ``right``.
+        
+        ``left @ right[j]`` scores every registration against registration
+        ``j`` in one matrix-vector product: shared food tags, a bonus for
+        known and different genders and a squared age-gap penalty.
+        """
+        ages, genders, foods = ScoringService.build_features(registrations)
+        known = genders.any(axis=1).astype(np.float64)
+        ones = np.ones_like(ages)
+        
+        food_w = ScoringService.FOOD_WEIGHT
+        gender_w = ScoringService.GENDER_WEIGHT
+        age_w = ScoringService.AGE_WEIGHT
+        
+        # age gap: -(a_i - a_j)^2 = -a_i^2 + 2 a_i a_j - a_j^2
+        left = np.column_stack([
+            food_w * foods,
+            -gender_w * genders,
+            gender_w * known,
+            2 * age_w * ages,
+            -age_w * np.square(ages),
+            ones
+        ])
+        right = np.column_stack([
+            foods,
+            genders,
+            known,
+            ages,
+            ones,
+            -age_w * np.square(ages)
+        ])
+        return left, right
+    
+    @staticmethod
+    def _grow_group(left, right, seeds, size, available):
+        """Grow a group from the ``seeds`` rows with the best-scoring available rows.
+        
+        Scores against the group are kept as a running sum, so each added
+        member costs one matrix-vector product over the bucket.
+        """
+        members = list(seeds)
+        available[members] = False
+        scores = left @ right[members].sum(axis=0)
+        for _ in range(size - len(members)):
+            best = int(np.argmax(np.where(available, scores, -np.inf)))
+            members.append(best)
+            available[best] = False
+            scores += left @ right[best]
+        return members
+    
+    @staticmethod
+    def pick_best(members, candidates, count):
+        """Pick the ``count`` candidates that fit best with the ``members``."""
+        if len(candidates) <= count:
+            return list(candidates)
+        
+        rows = list(members) + list(candidates)
+        left, right = ScoringService.pair_matrices(rows)
+        available = np.ones(len(rows), dtype=bool)
+        chosen = ScoringService._grow_group(
+            left, right, range(len(members)), len(members) + count, available
+        )
+        return [rows[i] for i in chosen[len(members):]]
+    
+    @staticmethod
+    def partition(registrations, sizes):
+        """Partition registrations into groups of the given sizes by compatibility.
+        
+        Each group is seeded with the oldest unassigned registration and
+        grown greedily with the candidate adding the most compatibility to
+        the members chosen so far. ``sizes`` must add up to the number of
+        registrations.
+        """
+        if not registrations:
+            return []
+        
+        left, right = ScoringService.pair_matrices(registrations)
+        available = np.ones(len(registrations), dtype=bool)
+        groups = []
+        
+        seed = 0
+        for size in sizes:
+            while not available[seed]:
+                seed += 1
+            members = ScoringService._grow_group(left, right, [seed], size, available)
+            groups.append([registrations[i] for i in members])
+        
+        return groups
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from sqlalchemy import event, func, inspect, select, true, update
+from sqlalchemy.orm import Session
+from flask import current_app
+from app.models import User, Event, DinnerRegistration, DinnerGroup, StatCounter
+from app import db
+from app.utils.cache import get_cache
+
+# Counted tables and the statuses counted per table
+COUNTED_MODELS = {
+    User: (),
+    Event: ('active', 'cancelled', 'completed'),
+    DinnerRegistration: ('pending', 'matched', 'completed', 'cancelled'),
+    DinnerGroup: ('active', 'completed', 'cancelled')
+}
+
+class StatsService:
+    @staticmethod
+    def key(model, status=None):
+        """Return the counter name for a table, or one status in it."""
+        name = model.__tablename__
+        return f'{name}:{status}' if status else name
+    
+    @staticmethod
+    def aggregate():
+        """Count every table and status in a single statement.
+        
+        Each table is scanned once, with a ``FILTER`` clause per status;
+        the per-table rows are joined into one. This is the source of
+        truth the counters are rebuilt from.
+        """
+        subqueries = []
+        for model, statuses in COUNTED_MODELS.items():
+            columns = [func.count().label(StatsService.key(model))]
+            columns += [
+                func.count().filter(model.status == status).label(StatsService.key(model, status))
+                for status in statuses
+            ]
+            subqueries.append(select(*columns).select_from(model).subquery())
+        
+        joined = subqueries[0]
+        for subquery in subqueries[1:]:
+            joined = joined.join(subquery, true())
+        row = db.session.execute(select(joined)).mappings().one()
+        return dict(row)
+    
+    @staticmethod
+    def rebuild():
+        """Recompute every counter from the tables."""
+        counts = StatsService.aggregate()
+        db.session.query(StatCounter).delete()
+        db.session.add_all([StatCounter(name, value) for name, value in counts.items()])
+        db.session.commit()
+        return counts
+    
+    @staticmethod
+    def counters():
+        """Read every counter in one primary-key scan, rebuilding them if missing."""
+        counts = dict(db.session.execute(select(StatCounter.name, StatCounter.value)).all())
+        if any(StatsService.key(model) not in counts for model in COUNTED_MODELS):
+            counts = StatsService.rebuild()
+        return counts
+    
+    @staticmethod
+    def bump(deltas, session=None):
+        """Add ``deltas`` (counter name -> change) to the transaction's pending counter changes.
+        
+        Bulk statements bypass the session events that keep counters up to
+        date, so they call this before committing. Nothing is written until
+        ``apply`` runs at commit.
+        """
+        session = session if session is not None else db.session()
+        pending = session.info.setdefault('stat_deltas', defaultdict(int))
+        for name, delta in deltas.items():
+            pending[name] += delta
+    
+    @staticmethod
+    def apply(session):
+        """Write the transaction's pending counter changes.
+        
+        Counters are updated in name order, so concurrent transactions lock
+        the counter rows in the same order and cannot deadlock on them.
+        Counters that were never built are left alone; ``rebuild`` will
+        count them.
+        """
+        pending = session.info.pop('stat_deltas', {})
+        for name in sorted(pending):
+            if pending[name]:
+                session.execute(
+                    update(StatCounter.__table__).where(
+                        StatCounter.__table__.c.name == name
+                    ).values(value=StatCounter.__table__.c.value + pending[name])
+                )
+    
+    @staticmethod
+    def flush_deltas(session):
+        """Work out how a flush changes the counters, from the session's pending state."""
+        deltas = defaultdict(int)
+        
+        def count(obj, sign, status):
+            model = type(obj)
+            deltas[StatsService.key(model)] += sign
+            if status in COUNTED_MODELS[model]:
+                deltas[StatsService.key(model, status)] += sign
+        
+        for obj in session.new:
+            if type(obj) in COUNTED_MODELS:
+                count(obj, 1, getattr(obj, 'status', None))
+        for obj in session.deleted:
+            if type(obj) in COUNTED_MODELS:
+                # Count the status the row had in the database, without loading it
+                status = None
+                if COUNTED_MODELS[type(obj)]:
+                    history = inspect(obj).attrs.status.history
+                    status = (history.deleted or history.unchanged or [None])[0]
+                count(obj, -1, status)
+        for obj in session.dirty:
+            if type(obj) not in COUNTED_MODELS or not COUNTED_MODELS[type(obj)]:
+                continue
+            history = inspect(obj).attrs.status.history
+            if history.added and history.deleted:
+                model = type(obj)
+                deltas[StatsService.key(model, history.deleted[0])] -= 1
+                deltas[StatsService.key(model, history.added[0])] += 1
+        return deltas
+    
+    @staticmethod
+    def dashboard():
+        """Dashboard statistics, cached for ``DASHBOARD_CACHE_SECONDS``."""
+        cache = get_cache('stats')
+        stats = cache.get('dashboard')
+        if stats is None:
+            counts = StatsService.counters()
+            stats = {
+                'total_users': counts.get('users', 0),
+                'total_events': counts.get('events', 0),
+                'total_dinner_registrations': counts.get('dinner_registrations', 0),
+                'total_dinner_groups': counts.get('dinner_groups', 0),
+                'pending_registrations': counts.get('dinner_registrations:pending', 0),
+                'active_events': counts.get('events:active', 0)
+            }
+            cache.set('dashboard', stats, timeout=current_app.config.get('DASHBOARD_CACHE_SECONDS', 10))
+        return stats
+
+@event.listens_for(Session, 'after_flush')
+def collect_stat_deltas(session, flush_context):
+    # The session still shows its pre-flush state here
+    StatsService.bump(StatsService.flush_deltas(session), session)
+
+@event.listens_for(Session, 'before_commit')
+def update_stat_counters(session):
+    # Commit flushes after this event; flush first so its changes are counted
+    session.flush()
+    StatsService.apply(session)
+
+@event.listens_for(Session, 'after_transaction_end')
+def discard_stat_deltas(session, transaction):
+    # Changes of a rolled back transaction never happened
+    if transaction.parent is None:
+        session.info.pop('stat_deltas', None)
@@ -1,4 +1,7 @@
 from .decorators import login_required, admin_required, get_current_user
 from .helpers import save_file
+from .query_counter import count_queries, query_budget, QueryBudgetExceeded
+from .food_tags import parse_food_tags, food_tag_names
+from .pagination import paginate, InvalidCursor
 
-__all__ = ['login_required', 'admin_required', 'get_current_user', 'save_file'] 
\ No newline at end of file
+__all__ = ['login_required', 'admin_required', 'get_current_user', 'save_file', 'count_queries', 'query_budget', 'QueryBudgetExceeded', 'parse_food_tags', 'food_tag_names', 'paginate', 'InvalidCursor']
\ No newline at end of file
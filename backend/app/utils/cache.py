@@ -0,0 +1,32 @@
+from cachelib import SimpleCache, RedisCache
+from flask import current_app
+
+# Caches by name, per process
+_caches = {}
+
+def get_cache(name='default'):
+    """Return the cache ``name``, created on first use.
+    
+    With ``CACHE_TYPE = 'simple'`` caches are per process and hold at most
+    ``CACHE_THRESHOLD`` entries. ``'redis'`` shares them through the Redis
+    at ``CACHE_REDIS_URL``, each name under its own key prefix. Entries
+    expire after ``CACHE_DEFAULT_TIMEOUT`` seconds unless a timeout is
+    given when setting them.
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        config = current_app.config
+        if config.get('CACHE_TYPE', 'simple') == 'redis':
+            import redis
+            cache = RedisCache(
+                host=redis.from_url(config['CACHE_REDIS_URL']),
+                default_timeout=config.get('CACHE_DEFAULT_TIMEOUT', 300),
+                key_prefix=f'{name}:'
+            )
+        else:
+            cache = SimpleCache(
+                threshold=config.get('CACHE_THRESHOLD', 500),
+                default_timeout=config.get('CACHE_DEFAULT_TIMEOUT', 300)
+            )
+        _caches[name] = cache
+    return cache
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+import hashlib
+from flask import request
+
+def make_validators(*values):
+    """Turn the values a response depends on into an ``(etag, last_modified)`` pair.
+    
+    The ETag hashes every value; Last-Modified is the latest datetime
+    among them (stored naive UTC).
+    """
+    etag = hashlib.sha1(repr(values).encode()).hexdigest()[:20]
+    timestamps = [value for value in values if isinstance(value, datetime)]
+    last_modified = max(timestamps).replace(tzinfo=timezone.utc) if timestamps else None
+    return etag, last_modified
+
+def is_not_modified(etag, last_modified):
+    """Whether the request's conditional headers match the current validators.
+    
+    ``If-None-Match`` wins over ``If-Modified-Since``, as RFC 9110 asks,
+    since only the ETag notices deletions that leave the latest timestamp
+    unchanged.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def set_validators(response, etag, last_modified):
+    """Attach the validators to a response and ask clients to revalidate."""
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,126 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import NullPool, QueuePool
+
+class PoolStats:
+    """Checkout counts and latency of this process's connection pools."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self.lock:
+            self.checkouts = 0
+            self.checkout_seconds = 0.0
+            self.max_checkout_seconds = 0.0
+            self.timeouts = 0
+            self.connects = 0
+            self.invalidations = 0
+    
+    def record_checkout(self, seconds):
+        with self.lock:
+            self.checkouts += 1
+            self.checkout_seconds += seconds
+            self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+    
+    def increment(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def to_dict(self):
+        with self.lock:
+            return {
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'timeouts': self.timeouts,
+                'avg_checkout_ms': self.checkout_seconds / self.checkouts * 1000 if self.checkouts else 0.0,
+                'max_checkout_ms': self.max_checkout_seconds * 1000
+            }
+
+pool_stats = PoolStats()
+
+class TimedPool:
+    """Pool mixin timing how long each checkout waits for a connection.
+    
+    The wait includes opening a new connection and the pre-ping, which is
+    what a request pays when the pool is cold, undersized or exhausted.
+    """
+    
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeout:
+            pool_stats.increment('timeouts')
+            raise
+        pool_stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+# Log under the stock pool loggers, not under this module's ``app`` logger,
+# which Flask sets to DEBUG in development
+class TimedQueuePool(TimedPool, QueuePool):
+    _sqla_logger_namespace = 'sqlalchemy.pool.impl.QueuePool'
+
+class TimedNullPool(TimedPool, NullPool):
+    _sqla_logger_namespace = 'sqlalchemy.pool.impl.NullPool'
+
+for _pool_class in (TimedQueuePool, TimedNullPool):
+    # New DB connections, and connections dropped by a failed pre-ping or error
+    event.listen(_pool_class, 'connect', lambda *args: pool_stats.increment('connects'))
+    event.listen(_pool_class, 'invalidate', lambda *args: pool_stats.increment('invalidations'))
+
+POOL_PROFILES = {
+    # SQLAlchemy's defaults: 5 kept connections plus 10 overflow per process
+    'default': {'poolclass': TimedQueuePool},
+    # One warm connection per instance, and a short wait instead of piling
+    # up; overflow connections close on checkin, so many cold instances do
+    # not pin the server's connection slots
+    'serverless': {
+        'poolclass': TimedQueuePool, 'pool_size': 1, 'max_overflow': 2, 'pool_timeout': 10,
+        'pool_pre_ping': True, 'pool_recycle': 300
+    },
+    # A fresh connection per checkout, for when even one idle connection
+    # per instance is too many
+    'nullpool': {'poolclass': TimedNullPool},
+    # Behind PgBouncer / Supabase in transaction mode: the external pooler
+    # pools, and server-side prepared statements must stay off since
+    # consecutive transactions may land on different server connections
+    'pgbouncer': {'poolclass': TimedNullPool},
+    # Long-running worker: a small pool, checked before use and recycled
+    # before server or load balancer idle timeouts; LIFO lets extras age out
+    'worker': {
+        'poolclass': TimedQueuePool, 'pool_size': 2, 'max_overflow': 2,
+        'pool_pre_ping': True, 'pool_recycle': 1800, 'pool_use_lifo': True
+    }
+}
+
+def engine_options(config):
+    """Build ``SQLALCHEMY_ENGINE_OPTIONS`` for the ``DB_POOL_PROFILE`` in ``config``.
+    
+    ``DB_POOL_SIZE``, ``DB_MAX_OVERFLOW`` and ``DB_POOL_RECYCLE`` override
+    the profile's numbers. In-memory SQLite keeps Flask-SQLAlchemy's
+    single shared connection.
+    """
+    profile = config.get('DB_POOL_PROFILE', 'default')
+    if profile not in POOL_PROFILES:
+        raise ValueError(f'Unknown DB_POOL_PROFILE {profile!r}, expected one of {", ".join(POOL_PROFILES)}')
+    
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    
+    options = dict(POOL_PROFILES[profile])
+    if options['poolclass'] is TimedQueuePool:
+        for key, option in (('DB_POOL_SIZE', 'pool_size'), ('DB_MAX_OVERFLOW', 'max_overflow'),
+                            ('DB_POOL_RECYCLE', 'pool_recycle')):
+            if config.get(key) is not None:
+                options[option] = config[key]
+    if profile == 'pgbouncer' and url.get_driver_name() == 'psycopg':
+        # psycopg 3 prepares statements after 5 runs; psycopg2 never does
+        options['connect_args'] = {'prepare_threshold': None}
+    return options
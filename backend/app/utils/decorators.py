@@ -1,6 +1,6 @@
 from functools import wraps
-from flask import session, jsonify
-from app.models.user import User
+from flask import session, jsonify, g
+from .user_cache import load_user
 
 def login_required(f):
     @wraps(f)
@@ -16,7 +16,7 @@ def admin_required(f):
         if 'user_id' not in session:
             return jsonify({'error': 'Authentication required'}), 401
             
-        user = User.query.get(session['user_id'])
+        user = get_current_user()
         if not user or user.role != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
             
@@ -24,7 +24,15 @@ def admin_required(f):
     return decorated_function
 
 def get_current_user():
-    """Helper function to get current user from session"""
+    """Helper function to get current user from session
+    
+    The user is resolved once per request and kept on ``flask.g``, so
+    ``admin_required`` and the route share a single lookup.
+    """
     if 'user_id' not in session:
         return None
-    return User.query.get(session['user_id']) 
\ No newline at end of file
+    user_id = session['user_id']
+    if g.get('current_user_id') != user_id:
+        g.current_user = load_user(user_id)
+        g.current_user_id = user_id
+    return g.current_user 
\ No newline at end of file
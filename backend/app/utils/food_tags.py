@@ -0,0 +1,44 @@
+import re
+
+# Dietary tags, one bit each in ``DinnerRegistration.makanan_tags``
+FOOD_TAGS = ['halal', 'vegetarian', 'vegan', 'no_pork', 'no_seafood', 'gluten_free']
+FOOD_TAG_BITS = {tag: 1 << bit for bit, tag in enumerate(FOOD_TAGS)}
+
+# Spellings seen in the registration form and free text, after normalisation
+FOOD_TAG_SYNONYMS = {
+    'tidak ada': None,
+    'none': None,
+    'halal': 'halal',
+    'vegetarian': 'vegetarian',
+    'vegetarian only': 'vegetarian',
+    'vegan': 'vegan',
+    'no pork': 'no_pork',
+    'non pork': 'no_pork',
+    'tanpa babi': 'no_pork',
+    'no seafood': 'no_seafood',
+    'tanpa seafood': 'no_seafood',
+    'gluten free': 'gluten_free',
+    'bebas gluten': 'gluten_free',
+    'tanpa gluten': 'gluten_free',
+}
+
+def parse_food_tags(makanan_preference):
+    """Tokenise a free-text food preference into a tag bitmask.
+
+    Tokens are split on ``,;/`` and ``dan``/``&``, lowercased and have
+    hyphens, underscores and repeated spaces collapsed; unknown tokens are
+    ignored.
+    """
+    if not makanan_preference:
+        return 0
+    mask = 0
+    for token in re.split(r'[,;/&]|\bdan\b', makanan_preference.lower()):
+        token = ' '.join(re.sub(r'[-_]', ' ', token).split())
+        tag = FOOD_TAG_SYNONYMS.get(token)
+        if tag:
+            mask |= FOOD_TAG_BITS[tag]
+    return mask
+
+def food_tag_names(mask):
+    """Return the tag names set in a bitmask, in ``FOOD_TAGS`` order."""
+    return [tag for tag in FOOD_TAGS if mask & FOOD_TAG_BITS[tag]]
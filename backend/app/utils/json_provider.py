@@ -0,0 +1,85 @@
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
+
+def _default(value):
+    """Encode the non-JSON types our responses contain, like ``to_dict`` does."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """The stdlib provider, with dates in ISO 8601 like the rest of the API."""
+    
+    default = staticmethod(_default)
+    sort_keys = False
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, which encodes dates natively."""
+    
+    options = orjson.OPT_NON_STR_KEYS if orjson else 0
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self.options).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand the encoded bytes straight to the response, without a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.options), mimetype='application/json'
+        )
+
+class MsgspecProvider(JSONProvider):
+    """JSON provider backed by msgspec, which encodes dates natively."""
+    
+    def __init__(self, app):
+        super().__init__(app)
+        self.encoder = msgspec.json.Encoder(enc_hook=_default)
+        self.decoder = msgspec.json.Decoder()
+    
+    def dumps(self, obj, **kwargs):
+        return self.encoder.encode(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return self.decoder.decode(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encoder.encode(obj), mimetype='application/json')
+
+JSON_PROVIDERS = {
+    'orjson': (OrjsonProvider, orjson),
+    'msgspec': (MsgspecProvider, msgspec),
+    'stdlib': (StdlibJSONProvider, True)
+}
+
+def json_provider_class(name='auto'):
+    """Pick the JSON provider named by ``JSON_PROVIDER``.
+    
+    ``'auto'`` prefers orjson, then msgspec, then the stdlib; a named
+    provider whose library is not installed also falls back to the stdlib.
+    """
+    names = ['orjson', 'msgspec'] if name == 'auto' else [name]
+    for candidate in names:
+        provider_class, available = JSON_PROVIDERS.get(candidate, (None, None))
+        if available:
+            return provider_class
+    return StdlibJSONProvider
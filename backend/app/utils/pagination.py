@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from flask import current_app, request
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import tuple_
+
+class InvalidCursor(ValueError):
+    """Raised for a pagination cursor that was not issued by this API."""
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='pagination-cursor')
+
+def encode_cursor(values):
+    """Sign the sort key of the last row into an opaque cursor."""
+    return _serializer().dumps([
+        value.isoformat() if isinstance(value, (date, datetime)) else value
+        for value in values
+    ])
+
+def decode_cursor(cursor, columns):
+    """Turn a cursor back into sort key values typed like ``columns``."""
+    try:
+        values = _serializer().loads(cursor)
+    except BadSignature:
+        raise InvalidCursor('Invalid pagination cursor')
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursor('Invalid pagination cursor')
+    
+    decoded = []
+    for value, column in zip(values, columns):
+        python_type = column.type.python_type
+        if python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif python_type is date:
+            value = date.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+def paginate(query, columns, key=None):
+    """Return one keyset page of ``query`` as ``(rows, pagination)``.
+    
+    Rows are ordered by ``columns`` descending (the last one must be
+    unique, e.g. the id) and the page starts after the request's
+    ``cursor``, so each page is an index range scan no matter how deep it
+    is. ``per_page`` is capped at ``PAGE_SIZE_MAX``. ``key`` extracts the
+    sort values from a row and defaults to reading ``columns`` off it.
+    """
+    if key is None:
+        key = lambda row: tuple(getattr(row, column.key) for column in columns)
+    
+    per_page = request.args.get('per_page', current_app.config.get('PAGE_SIZE_DEFAULT', 20), type=int)
+    per_page = max(1, min(per_page, current_app.config.get('PAGE_SIZE_MAX', 100)))
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        query = query.filter(tuple_(*columns) < tuple_(*decode_cursor(cursor, columns)))
+    
+    # One extra row tells whether another page follows
+    rows = query.order_by(*(column.desc() for column in columns)).limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    
+    return rows, {
+        'per_page': per_page,
+        'has_more': has_more,
+        'next_cursor': encode_cursor(key(rows[-1])) if has_more else None
+    }
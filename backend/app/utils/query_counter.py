@@ -0,0 +1,58 @@
+from contextlib import contextmanager
+from functools import wraps
+import threading
+from flask import current_app
+from sqlalchemy import event
+from app import db
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a view issues more SQL statements than its budget allows."""
+
+class QueryCounter:
+    """Count the SQL statements sent to an engine."""
+    
+    def __init__(self, thread=None):
+        self.count = 0
+        self.thread = thread
+    
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        # Other threads share the engine; only count our own statements
+        if self.thread is None or threading.get_ident() == self.thread:
+            self.count += 1
+
+@contextmanager
+def count_queries(engine, this_thread=False):
+    """Count the statements ``engine`` executes inside the ``with`` block.
+    
+    With ``this_thread`` only statements issued by the calling thread are
+    counted, so concurrent requests do not inflate each other's counts.
+    """
+    counter = QueryCounter(threading.get_ident() if this_thread else None)
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+def query_budget(limit):
+    """Cap the SQL statements a view may issue, to catch N+1 regressions.
+    
+    With ``QUERY_BUDGET_ENFORCE`` set (the testing config) going over the
+    budget raises ``QueryBudgetExceeded``; otherwise it is logged as a
+    warning. The count is exposed in the ``X-Query-Count`` header.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            with count_queries(db.engine, this_thread=True) as counter:
+                response = current_app.make_response(f(*args, **kwargs))
+            
+            if counter.count > limit:
+                message = f'{f.__name__} issued {counter.count} SQL statements, budget is {limit}'
+                if current_app.config.get('QUERY_BUDGET_ENFORCE'):
+                    raise QueryBudgetExceeded(message)
+                current_app.logger.warning(message)
+            response.headers['X-Query-Count'] = str(counter.count)
+            return response
+        return decorated_function
+    return decorator
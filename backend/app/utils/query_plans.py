@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from sqlalchemy import func, select
+from app.models import Event, Registration, DinnerRegistration, MatchingJob
+from app import db
+
+def hot_queries():
+    """The lookups on the request and matching hot paths, as ``(name, statement)`` pairs.
+    
+    Parameters come from a row of the current database where there is one,
+    so the plans reflect the data the planner actually sees.
+    """
+    sample = db.session.query(DinnerRegistration).filter_by(status='pending').first() \
+        or db.session.query(DinnerRegistration).first()
+    bucket = (
+        (sample.kota, sample.budget_preference, sample.tanggal_tersedia, sample.waktu_preference)
+        if sample else ('Jakarta', '100k-200k', date.today(), 'malam')
+    )
+    registration = db.session.query(Registration).first()
+    user_id, event_id = (registration.user_id, registration.event_id) if registration else (1, 1)
+    group_id = db.session.scalar(select(DinnerRegistration.group_id).where(
+        DinnerRegistration.group_id.isnot(None)
+    ).limit(1)) or 1
+    
+    kota, budget, tanggal, waktu = bucket
+    return [
+        ('matching bucket lookup', select(DinnerRegistration).where(
+            DinnerRegistration.status == 'pending',
+            DinnerRegistration.kota == kota,
+            DinnerRegistration.budget_preference == budget,
+            DinnerRegistration.tanggal_tersedia == tanggal,
+            DinnerRegistration.waktu_preference == waktu
+        ).order_by(DinnerRegistration.created_at, DinnerRegistration.id).limit(8)),
+        ('matching pending pool', select(DinnerRegistration.id, DinnerRegistration.kota).where(
+            DinnerRegistration.status == 'pending'
+        ).order_by(DinnerRegistration.created_at, DinnerRegistration.id)),
+        ('stale pending cleanup', select(DinnerRegistration.id).where(
+            DinnerRegistration.status == 'pending',
+            DinnerRegistration.created_at < datetime.utcnow()
+        )),
+        ('group members', select(DinnerRegistration).where(DinnerRegistration.group_id == group_id)),
+        ('already registered', select(Registration).where(
+            Registration.user_id == user_id, Registration.event_id == event_id
+        ).limit(1)),
+        ('my registrations', select(Registration).where(Registration.user_id == user_id)),
+        ('event registration count', select(func.count(Registration.id)).where(Registration.event_id == event_id)),
+        ('events list page', select(Event).order_by(Event.date.desc(), Event.id.desc()).limit(21)),
+        ('next queued job', select(MatchingJob.id).where(
+            MatchingJob.status == 'queued'
+        ).order_by(MatchingJob.created_at, MatchingJob.id).limit(1))
+    ]
+
+def explain(statement):
+    """Return the database's plan for ``statement`` as lines of text."""
+    connection = db.session.connection()
+    dialect = connection.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    if dialect.name == 'sqlite':
+        # Rows are (id, parent, notused, detail); indent children under parents
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}').all()
+        depth = {0: -1}
+        lines = []
+        for node, parent, _, detail in rows:
+            depth[node] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node] + detail)
+        return lines
+    return [row[0] for row in connection.exec_driver_sql(f'EXPLAIN {sql}')]
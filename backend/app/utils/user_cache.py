@@ -0,0 +1,99 @@
+from collections import OrderedDict
+import threading
+import time
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.user import User
+from app import db
+
+class UserCache:
+    """Process-local LRU of user rows, as plain column values.
+    
+    Entries expire after ``ttl`` seconds, which bounds how stale a row
+    written by another process can get; writes in this process evict the
+    row straight away.
+    """
+    
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            values, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return values
+    
+    def set(self, user_id, values):
+        with self.lock:
+            self.entries[user_id] = (values, time.monotonic() + self.ttl)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+    
+    def discard(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+# One cache per process, created on first use when USER_CACHE_SIZE > 0
+_cache = None
+
+def _get_cache():
+    global _cache
+    size = current_app.config.get('USER_CACHE_SIZE', 0)
+    if not size:
+        return None
+    if _cache is None:
+        _cache = UserCache(size, current_app.config.get('USER_CACHE_TTL', 60))
+    return _cache
+
+def load_user(user_id):
+    """Load a user into the request's session, from the LRU when possible.
+    
+    A cached row is rebuilt as a detached instance and merged with
+    ``load=False``, so a hit issues no SELECT while the returned user still
+    lazy-loads its relationships as usual.
+    """
+    cache = _get_cache()
+    values = cache.get(user_id) if cache else None
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user is not None and cache:
+            cache.set(user_id, {column.key: getattr(user, column.key) for column in inspect(User).column_attrs})
+        return user
+    
+    detached = inspect(User).class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(detached, key, value)
+    make_transient_to_detached(detached)
+    return db.session.merge(detached, load=False)
+
+def invalidate_user(user_id):
+    """Drop a user from the LRU."""
+    if _cache is not None:
+        _cache.discard(user_id)
+
+@event.listens_for(Session, 'after_flush')
+def collect_written_users(session, flush_context):
+    # Any profile, role or account write evicts the cached row
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            invalidate_user(obj.id)
+            session.info.setdefault('written_users', set()).add(obj.id)
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def invalidate_written_users(session):
+    # Another thread may have cached the old row between flush and commit
+    for user_id in session.info.pop('written_users', ()):
+        invalidate_user(user_id)
@@ -0,0 +1,138 @@
+"""
+Micro-benchmark for JSON response encoding.
+
+Seeds events, users, dinner registrations and groups, then for every
+available JSON provider measures, per endpoint:
+
+- encode: encoding the endpoint's payload for ``--rows`` rows (projection
+  built once, outside the timing);
+- request: a full GET of one page through the test client.
+
+    python benchmark_json.py --rows 10000
+    python benchmark_json.py --rows 10000 --providers stdlib orjson
+
+The target database is dropped and recreated.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+def seed(count, rng):
+    """Recreate the schema with ``count`` events, registrations and users."""
+    from sqlalchemy import insert
+    from app import db, migrations
+    from app.models import User, Event, Registration, DinnerRegistration
+    from app.services import MatchingService
+    from benchmark_matching import generate_rows
+
+    db.session.remove()
+    migrations.reset(db.engine)
+
+    now = datetime.utcnow()
+    db.session.execute(insert(User), [
+        {'username': f'bench{i}', 'email': f'bench{i}@example.com', 'password_hash': '', 'role': 'user',
+         'full_name': f'Bench User {i}', 'created_at': now - timedelta(minutes=i), 'updated_at': now}
+        for i in range(count)
+    ])
+    db.session.execute(insert(Event), [
+        {'title': f'Event {i}', 'description': 'Makan malam bersama ' * 5, 'location': 'Jakarta',
+         'date': now + timedelta(hours=i), 'max_participants': 6, 'status': 'active',
+         'organizer_id': rng.randint(1, count), 'created_at': now, 'updated_at': now}
+        for i in range(count)
+    ])
+    db.session.execute(insert(Registration), [
+        {'user_id': rng.randint(1, count), 'event_id': rng.randint(1, count), 'status': 'pending',
+         'created_at': now, 'updated_at': now}
+        for _ in range(count)
+    ])
+    db.session.execute(insert(DinnerRegistration), list(generate_rows(count, list(range(1, count + 1)), rng)))
+    db.session.commit()
+    MatchingService.match_registrations()
+
+def payloads(count):
+    """Build each endpoint's response payload for ``count`` rows."""
+    from app.models import User, Event, DinnerRegistration, DinnerGroup
+    from app.serializers import EventSerializer, DinnerSerializer
+
+    events = EventSerializer.list_query().order_by(Event.date.desc()).limit(count).all()
+    users = User.query.limit(count).all()
+    registrations = DinnerRegistration.query.options(
+        *DinnerSerializer.admin_registration_options()
+    ).limit(count).all()
+    groups = DinnerGroup.query.options(*DinnerSerializer.group_options()).limit(count).all()
+    return {
+        '/api/events': {'events': [EventSerializer.list_item(event, n) for event, n in events]},
+        '/api/admin/events': {'events': [EventSerializer.admin_item(event, n) for event, n in events]},
+        '/api/admin/users': {'users': [user.to_dict() for user in users]},
+        '/api/admin/dinner-registrations': {
+            'registrations': [DinnerSerializer.admin_registration(reg) for reg in registrations]
+        },
+        '/api/admin/dinner-groups': {'groups': [DinnerSerializer.group(group) for group in groups]}
+    }
+
+def best_of(func, repeat):
+    """Return the fastest of ``repeat`` runs of ``func``, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding of API responses.')
+    parser.add_argument('--rows', type=int, default=10000, help='rows per table and per encoded payload')
+    parser.add_argument('--providers', nargs='+', default=['stdlib', 'msgspec', 'orjson'],
+                        help='JSON providers to compare (unavailable ones are skipped)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement, best is reported')
+    parser.add_argument('--database-url', default='sqlite:///' + os.path.abspath('benchmark_json.db'),
+                        help='database to benchmark against; it is dropped and recreated')
+    parser.add_argument('--seed', type=int, default=42, help='random seed')
+    args = parser.parse_args()
+
+    # Config reads DATABASE_URL at import time
+    os.environ['DATABASE_URL'] = args.database_url
+    from app import create_app, db
+    from app.models import User
+    from app.utils.json_provider import JSON_PROVIDERS
+
+    app = create_app('development')
+    app.config['SQLALCHEMY_ECHO'] = False
+    # Debug mode pretty-prints stdlib responses; measure what production sends
+    app.debug = False
+    with app.app_context():
+        seed(args.rows, random.Random(args.seed))
+        admin = db.session.get(User, 1)
+        admin.role = 'admin'
+        db.session.commit()
+        bodies = payloads(args.rows)
+
+    print(f'Encoding {args.rows:,} rows per payload; requests fetch one page of {app.config["PAGE_SIZE_MAX"]}')
+    print(f'  {"endpoint":<34}{"provider":<10}{"encode":>12}{"MB/s":>10}{"request":>12}')
+    for provider in args.providers:
+        provider_class, available = JSON_PROVIDERS.get(provider, (None, None))
+        if not available:
+            print(f'  {provider} is not installed, skipped')
+            continue
+        app.json = provider_class(app)
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['user_id'] = 1
+
+        with app.app_context():
+            for url, body in bodies.items():
+                size = len(app.json.response(body).get_data())
+                encode = best_of(lambda: app.json.response(body), args.repeat)
+                request = best_of(
+                    lambda: client.get(url, query_string={'per_page': app.config['PAGE_SIZE_MAX']}),
+                    args.repeat
+                )
+                print(f'  {url:<34}{provider:<10}{encode * 1000:>10.2f}ms'
+                      f'{size / encode / 2**20:>10.0f}{request * 1000:>10.2f}ms')
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,8 @@
-from app import create_app, db
+from app import create_app, db, migrations
 
 app = create_app('development')
 
 with app.app_context():
-    print('Dropping all tables...')
-    db.drop_all()
-    print('Creating all tables...')
-    db.create_all()
+    print('Dropping all tables and migrating from scratch...')
+    migrations.reset(db.engine)
     print('Database has been reset successfully!') 
\ No newline at end of file
@@ -0,0 +1,83 @@
+from collections import Counter, namedtuple
+from functools import lru_cache
+import random
+import pytest
+from app.services import MatchingService
+
+Member = namedtuple('Member', ['id', 'min_participants', 'max_participants'])
+
+def bucket_of(windows):
+    return [Member(i, low, high) for i, (low, high) in enumerate(windows)]
+
+def exhaustive_optimum(windows):
+    """Most members placeable, trying every way to form every group."""
+    types = sorted(set(windows))
+    start = Counter(windows)
+    
+    @lru_cache(maxsize=None)
+    def best(counts):
+        # Either drop one member of the first type left, or seat it in a group
+        first = next((i for i, count in enumerate(counts) if count), None)
+        if first is None:
+            return 0
+        rest = list(counts)
+        rest[first] -= 1
+        result = best(tuple(rest))
+        low, high = types[first]
+        for size in range(low, high + 1):
+            fitting = [i for i, (lo, hi) in enumerate(types) if lo <= size <= hi]
+            
+            def companions(j, needed):
+                nonlocal result
+                if needed == 0:
+                    result = max(result, size + best(tuple(rest)))
+                    return
+                if j == len(fitting):
+                    return
+                i = fitting[j]
+                for taken in range(min(needed, rest[i]), -1, -1):
+                    rest[i] -= taken
+                    companions(j + 1, needed - taken)
+                    rest[i] += taken
+            
+            companions(0, size - 1)
+        return result
+    
+    return best(tuple(start[t] for t in types))
+
+def placed(bucket, max_group_size=12):
+    """Check the plans are valid and return how many members they place."""
+    seen = set()
+    for members, sizes in MatchingService.pack_bucket(bucket, max_group_size):
+        assert sum(sizes) == len(members)
+        assert [member.id for member in members] == sorted(member.id for member in members)
+        for member in members:
+            assert member.id not in seen
+            seen.add(member.id)
+            high = min(member.max_participants, max_group_size)
+            assert all(member.min_participants <= size <= high for size in sizes)
+    return len(seen)
+
+def random_windows(rng, count, largest):
+    windows = []
+    for _ in range(count):
+        low = rng.randint(1, largest)
+        windows.append((low, rng.randint(low, largest)))
+    return windows
+
+def test_overlapping_windows_share_groups():
+    assert placed(bucket_of([(2, 2), (5, 5), (5, 5), (5, 6), (2, 6)])) == 2
+
+@pytest.mark.parametrize('seed', range(4))
+def test_places_as_many_as_an_exhaustive_search(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        windows = random_windows(rng, rng.randint(1, 8), 6)
+        assert placed(bucket_of(windows)) == exhaustive_optimum(windows), windows
+
+def test_large_buckets_yield_valid_groups():
+    rng = random.Random(0)
+    windows = random_windows(rng, 5000, 12) + [(2, 100000)] * 50
+    assert placed(bucket_of(windows)) == len(windows)
+    # Sizes above max_group_size are never used
+    assert placed(bucket_of([(8, 10)] * 20), max_group_size=6) == 0
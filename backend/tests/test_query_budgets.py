@@ -0,0 +1,64 @@
+from datetime import date, datetime, timedelta
+import pytest
+from app import create_app, db
+from app.models import User, Event, Registration, DinnerRegistration, DinnerGroup
+from app.services import EventCacheService
+
+# Rows per table; enough that an N+1 query would blow every budget
+ROWS = 5
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        EventCacheService.cache().clear()
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def seeded(app):
+    admin = User('admin', 'admin@example.com', 'password', role='admin')
+    users = [User(f'user{i}', f'user{i}@example.com', 'password') for i in range(ROWS)]
+    db.session.add_all([admin, *users])
+    db.session.flush()
+    
+    events = [
+        Event(f'Event {i}', 'Dinner meetup', 'Jakarta', datetime.now() + timedelta(days=i + 1), 10, admin.id)
+        for i in range(ROWS)
+    ]
+    db.session.add_all(events)
+    db.session.flush()
+    db.session.add_all(Registration(user.id, event.id) for event in events for user in users)
+    
+    tanggal = date.today() + timedelta(days=1)
+    groups = [DinnerGroup('Jakarta', '100k-200k', tanggal, 'malam') for _ in range(ROWS)]
+    db.session.add_all(groups)
+    db.session.flush()
+    for group in groups:
+        for user in users:
+            registration = DinnerRegistration(user.id, 'Jakarta', '100k-200k', tanggal, 'malam', status='matched')
+            registration.group_id = group.id
+            db.session.add(registration)
+    db.session.commit()
+    return {'admin': admin.id, 'event': events[0].id}
+
+def client_for(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    return client
+
+@pytest.mark.parametrize('url, queries', [
+    ('/api/events', 2),
+    ('/api/events/{event}', 3),
+    ('/api/admin/users', 1),
+    ('/api/admin/events', 1),
+    ('/api/admin/dinner-registrations', 1),
+    ('/api/admin/dinner-groups', 2),
+])
+def test_endpoint_stays_within_query_budget(app, seeded, url, queries):
+    # QUERY_BUDGET_ENFORCE is on in testing, so going over the budget raises
+    response = client_for(app, seeded['admin']).get(url.format(**seeded))
+    
+    assert response.status_code == 200
+    assert response.headers['X-Query-Count'] == str(queries)
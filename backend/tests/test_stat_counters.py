@@ -0,0 +1,79 @@
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app import create_app, db
+from app.models import User, DinnerRegistration, DinnerGroup
+from app.services import MatchingService, StatsService
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    app.config['MATCHING_ONLINE'] = False
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def users(app):
+    users = [User(f'user{i}', f'user{i}@example.com', 'password') for i in range(6)]
+    db.session.add_all(users)
+    db.session.commit()
+    StatsService.rebuild()
+    return [user.id for user in users]
+
+def client_for(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    return client
+
+def register(app, user_id):
+    response = client_for(app, user_id).post('/api/daftar-dinner', json={
+        'kota': 'Jakarta',
+        'budget_preference': '100k-200k',
+        'tanggal_tersedia': (date.today() + timedelta(days=1)).isoformat(),
+        'waktu_preference': 'malam',
+        'min_participants': 2,
+        'max_participants': 3
+    })
+    assert response.status_code == 200
+
+def cancel(app, registration):
+    response = client_for(app, registration.user_id).delete(f'/api/dinner-registration/{registration.id}')
+    assert response.status_code == 200
+
+def assert_counters_match():
+    db.session.expire_all()
+    assert StatsService.counters() == StatsService.aggregate()
+
+def test_counters_follow_the_registration_lifecycle(app, users):
+    for user_id in users[:5]:
+        register(app, user_id)
+    assert_counters_match()
+    
+    # Five registrations accepting 2 or 3 people make a group of 3 and one of 2
+    groups = MatchingService.match_registrations()
+    assert sorted(len(group.registrations) for group in groups) == [2, 3]
+    assert_counters_match()
+    
+    # A pending registration replaces a member leaving the group of 3
+    register(app, users[5])
+    trio = next(group for group in groups if len(group.registrations) == 3)
+    cancel(app, trio.registrations[0])
+    assert DinnerRegistration.query.filter_by(user_id=users[5]).one().group_id == trio.id
+    assert_counters_match()
+    
+    # Nobody is left to replace a member of the pair, so it dissolves
+    pair = next(group for group in groups if len(group.registrations) == 2)
+    pair_id = pair.id
+    cancel(app, pair.registrations[0])
+    assert db.session.get(DinnerGroup, pair_id) is None
+    assert_counters_match()
+    
+    # The remaining member goes stale and is cleaned up
+    db.session.execute(update(DinnerRegistration).where(
+        DinnerRegistration.status == 'pending'
+    ).values(created_at=datetime.utcnow() - timedelta(days=8)))
+    db.session.commit()
+    assert MatchingService.cleanup_old_registrations() == 1
+    assert_counters_match()
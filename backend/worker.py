@@ -0,0 +1,17 @@
+import os
+
+# A long-running process: keep a small pool, pre-pinged and recycled
+os.environ.setdefault('DB_POOL_PROFILE', 'worker')
+
+from app import create_app
+from app.services import JobService
+
+# Runs matching and cleanup jobs outside the web process, e.g. as a separate
+# dyno or container next to the serverless API. Deployments running it set
+# MATCHING_RUN_IN_BACKGROUND=1, and MATCHING_SCHEDULE_SECONDS for periodic runs
+env = os.getenv('FLASK_ENV', 'development')
+app = create_app(env)
+
+if __name__ == '__main__':
+    with app.app_context():
+        JobService.work()